@@ -1,10 +1,178 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+from django.db.models import Q
 
-from .models import Category, Location, Post
+from .deletion import soft_delete_user
+from .models import (
+    Category, Comment, DeletionTask, FingerprintBucket, Location, Post,
+    PostFingerprint, PostReaders, RelatedPost,
+)
+from .feed_counts import invalidate_feed_counts
+from .paginator import EstimatedCountPaginator
+from .stats import refresh_user_stats
+
+
+class DuplicateFilter(admin.SimpleListFilter):
+    title = 'копия другой публикации'
+    parameter_name = 'duplicate'
+
+    def lookups(self, request, model_admin):
+        return (('yes', 'Да'), ('no', 'Нет'))
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(
+                fingerprint__duplicate_of__isnull=False
+            )
+        if self.value() == 'no':
+            return queryset.exclude(
+                fingerprint__duplicate_of__isnull=False
+            )
+        return queryset
 
 
 class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title',
+        'author',
+        'category',
+        'location',
+        'pub_date',
+        'is_published',
+    )
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', DuplicateFilter, 'category', 'pub_date')
+    search_fields = ('title',)
+    autocomplete_fields = ('author',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = 'Не задано'
+    actions = ('publish', 'unpublish', 'delete_with_comments')
+
+    @admin.action(description='Опубликовать выбранные публикации')
+    def publish(self, request, queryset):
+        updated = queryset.update(is_published=True)
+        invalidate_feed_counts()
+        self.message_user(request, f'Опубликовано публикаций: {updated}.')
+
+    @admin.action(description='Снять с публикации выбранные публикации')
+    def unpublish(self, request, queryset):
+        updated = queryset.update(is_published=False)
+        invalidate_feed_counts()
+        self.message_user(
+            request, f'Снято с публикации публикаций: {updated}.'
+        )
+
+    @admin.action(description='Удалить выбранные публикации с комментариями')
+    def delete_with_comments(self, request, queryset):
+        # Комментарии, скетчи, похожие, подписи и сами публикации удаляются
+        # запросами DELETE без загрузки объектов в память сборщиком
+        # каскада. Сигналы при этом не отправляются, поэтому
+        # статистика авторов и размеры лент пересчитываются явно.
+        comments_queryset = Comment.objects.filter(post__in=queryset)
+        with transaction.atomic():
+            author_ids = set(
+                queryset.values_list('author_id', flat=True)
+            ).union(comments_queryset.values_list('author_id', flat=True))
+            comments = comments_queryset._raw_delete(comments_queryset.db)
+            readers_queryset = PostReaders.objects.filter(post__in=queryset)
+            readers_queryset._raw_delete(readers_queryset.db)
+            related_queryset = RelatedPost.objects.filter(
+                Q(post__in=queryset) | Q(related__in=queryset)
+            )
+            related_queryset._raw_delete(related_queryset.db)
+            PostFingerprint.objects.filter(
+                duplicate_of__in=queryset
+            ).update(duplicate_of=None)
+            for dependent in (FingerprintBucket, PostFingerprint):
+                dependent_queryset = dependent.objects.filter(
+                    post__in=queryset
+                )
+                dependent_queryset._raw_delete(dependent_queryset.db)
+            posts = queryset._raw_delete(queryset.db)
+            refresh_user_stats(author_ids)
+        invalidate_feed_counts()
+        self.message_user(
+            request,
+            f'Удалено публикаций: {posts}, комментариев: {comments}.'
+        )
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('text', 'author', 'post', 'created_at')
+    list_select_related = ('author', 'post')
+    list_filter = ('created_at',)
+    search_fields = ('text', 'author__username')
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('post',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ('delete_comments', 'delete_all_by_authors')
+
+    # Комментарии удаляются одним запросом DELETE без сборщика
+    # каскада и сигналов, поэтому статистика авторов пересчитывается
+    # явно.
+
+    def delete_with_stats(self, queryset):
+        with transaction.atomic():
+            author_ids = set(queryset.values_list('author_id', flat=True))
+            deleted = queryset._raw_delete(queryset.db)
+            refresh_user_stats(author_ids)
+        return deleted, author_ids
+
+    @admin.action(description='Удалить выбранные комментарии')
+    def delete_comments(self, request, queryset):
+        deleted, _ = self.delete_with_stats(queryset)
+        self.message_user(request, f'Удалено комментариев: {deleted}.')
+
+    @admin.action(description='Удалить все комментарии авторов выбранных')
+    def delete_all_by_authors(self, request, queryset):
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        deleted, _ = self.delete_with_stats(
+            Comment.objects.filter(author__in=author_ids)
+        )
+        self.message_user(
+            request,
+            f'Удалено комментариев: {deleted} '
+            f'от пользователей: {len(author_ids)}.'
+        )
+
+
+class SoftDeleteUserAdmin(UserAdmin):
+    # Пользователь отключается сразу, а его публикации и комментарии
+    # удаляет reap_deleted пачками. Страница подтверждения не собирает
+    # все зависимые объекты через сборщик каскада.
+
+    def get_deleted_objects(self, objs, request):
+        users = list(objs)
+        model_count = {self.opts.verbose_name_plural: len(users)}
+        return [str(user) for user in users], model_count, set(), []
+
+    def delete_model(self, request, obj):
+        soft_delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            soft_delete_user(user)
+
+
+class DeletionTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__',
+        'created_at',
+        'comments_deleted',
+        'posts_deleted',
+        'finished_at',
+    )
+    list_filter = ('kind', 'finished_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -12,3 +180,7 @@ admin.site.empty_value_display = 'Не задано'
 admin.site.register(Category)
 admin.site.register(Location)
 admin.site.register(Post, PostAdmin)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(DeletionTask, DeletionTaskAdmin)
+admin.site.unregister(get_user_model())
+admin.site.register(get_user_model(), SoftDeleteUserAdmin)
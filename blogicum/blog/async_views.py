@@ -0,0 +1,173 @@
+"""Асинхронные варианты вью функций ленты и страницы публикации.
+
+Обращения к ORM выполняются через `sync_to_async` в общем потоке
+синхронного кода, где они всё равно идут одно за другим, поэтому все
+выборки страницы собраны в одну синхронную функцию: один переход
+между потоками на страницу вместо перехода на каждую выборку.
+Шаблон рендерится уже по загруженным объектам.
+"""
+import asyncio
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, get_object_or_404
+from django.views import View
+
+from .category_cache import get_published_category
+from .constants import POSTS_ON_PAGE, PROFILE_HEADER_CACHE_TIMEOUT
+from .deletion import get_visible_comments, get_visible_users
+from .feed_counts import (
+    INDEX_FEED, TRENDING_FEED, get_author_feed, get_category_feed
+)
+from .forms import CommentForm
+from .paginator import CachedCountPaginator
+from .stats import get_user_stats
+from .view_counts import get_reader, record_view
+from .views import (
+    get_author_posts, get_post_object, get_related_posts,
+    get_trending_posts, get_visible_post,
+)
+
+
+async_render = sync_to_async(render)
+
+
+def load_page(posts_queryset, page_number, feed):
+    """Страница ленты с уже загруженными публикациями."""
+    paginator = CachedCountPaginator(posts_queryset, POSTS_ON_PAGE, feed)
+    page_obj = paginator.get_page(page_number)
+    page_obj.object_list = list(page_obj.object_list)
+    return page_obj
+
+
+get_page = sync_to_async(load_page)
+
+
+@sync_to_async
+def get_category_page(category_slug, page_number):
+    """Категория и страница её ленты."""
+    category = get_published_category(category_slug)
+    return category, load_page(
+        get_post_object().filter(category_id=category.pk),
+        page_number,
+        get_category_feed(category.pk),
+    )
+
+
+@sync_to_async
+def get_profile_page(request, username, page_number):
+    """Автор со статистикой и страница его ленты.
+
+    Скрытые публикации видит только сам автор.
+    """
+    profile = get_object_or_404(
+        get_visible_users().select_related('stats'), username=username
+    )
+    show_hidden = (
+        request.user.is_authenticated and request.user.pk == profile.pk
+    )
+    page_obj = load_page(
+        get_author_posts(profile, show_hidden=show_hidden),
+        page_number,
+        get_author_feed(profile.pk, show_hidden=show_hidden),
+    )
+    return profile, get_user_stats(profile), page_obj
+
+
+@sync_to_async
+def get_post_page(request, post_id):
+    """Публикация, её комментарии и похожие; учёт просмотра."""
+    post = get_visible_post(request.user, post_id)
+    record_view(post.pk, get_reader(request))
+    comments = list(
+        get_visible_comments().filter(post=post).select_related('author')
+    )
+    return post, comments, list(get_related_posts(post.pk))
+
+
+async def index(request):
+    """Асинхронная вью функция главной страницы."""
+    page_obj = await get_page(
+        get_post_object(), request.GET.get('page'), INDEX_FEED
+    )
+    context = {
+        'page_obj': page_obj
+    }
+    template = 'blog/index.html'
+    return await async_render(request, template, context)
+
+
+async def trending(request):
+    """Асинхронная вью функция ленты обсуждаемых публикаций."""
+    page_obj = await get_page(
+        get_trending_posts(), request.GET.get('page'), TRENDING_FEED
+    )
+    context = {
+        'page_obj': page_obj
+    }
+    template = 'blog/trending.html'
+    return await async_render(request, template, context)
+
+
+async def category_posts(request, category_slug):
+    """Асинхронная вью функция для страницы категории."""
+    template = 'blog/category.html'
+    category, page_obj = await get_category_page(
+        category_slug, request.GET.get('page')
+    )
+    context = {
+        'category': category,
+        'page_obj': page_obj
+    }
+    return await async_render(request, template, context)
+
+
+async def profile(request, username):
+    """Асинхронная вью функция для страницы пользователя."""
+    profile, stats, page_obj = await get_profile_page(
+        request, username, request.GET.get('page')
+    )
+    template_name = 'blog/profile.html'
+    context = {
+        'page_obj': page_obj,
+        'profile': profile,
+        'stats': stats,
+        'header_cache_timeout': PROFILE_HEADER_CACHE_TIMEOUT,
+    }
+    return await async_render(request, template_name, context)
+
+
+class PostDetailView(View):
+    """Асинхронный вью класс для страницы отдельного поста."""
+
+    template_name = 'blog/detail.html'
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Вью-корутина для обработчиков Django.
+
+        Django 3.2 не распознаёт асинхронные методы классов и вернул
+        бы из вью не ответ, а неожиданную корутину.
+        """
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        return update_wrapper(async_view, view)
+
+    async def get(self, request, post_id):
+        """Получение публикации, комментариев и похожих публикаций."""
+        post, comments, related_posts = await get_post_page(
+            request, post_id
+        )
+        context = {
+            'post': post,
+            'object': post,
+            'form': CommentForm(),
+            'comments': comments,
+            'related_posts': related_posts,
+        }
+        return await async_render(request, self.template_name, context)
@@ -0,0 +1,212 @@
+"""Потоковые выгрузка и загрузка данных блога.
+
+Формат — JSON Lines: каждая строка является записью того же вида,
+что и элементы `db.json` (`model`, `pk`, `fields`). Загрузка понимает
+и обычный JSON-массив, разбирая его по одному элементу. Загружаются
+только выгружаемые модели: служебные записи `db.json` (права, сессии,
+журнал админки) создаются заново при миграции или не нужны.
+"""
+import json
+import os
+from itertools import groupby, islice
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+EXPORT_MODELS = (
+    'auth.user',
+    'blog.category',
+    'blog.location',
+    'blog.post',
+    'blog.comment',
+)
+
+READ_CHUNK_SIZE = 1 << 16
+
+
+def export_records(stream, labels=EXPORT_MODELS, chunk_size=2000):
+    """Выгрузка моделей в поток по порядку первичных ключей.
+
+    Записи читаются порциями по ключу, поэтому в памяти находится
+    не больше chunk_size объектов. Возвращает число записей.
+    """
+    total = 0
+    for label in labels:
+        model = apps.get_model(label)
+        queryset = model._base_manager.order_by('pk').prefetch_related(
+            *(field.name for field in model._meta.many_to_many)
+        )
+        last_pk = None
+        while True:
+            chunk_queryset = queryset
+            if last_pk is not None:
+                chunk_queryset = queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset[:chunk_size])
+            if not chunk:
+                break
+            for record in serializers.serialize('python', chunk):
+                stream.write(json.dumps(
+                    record, cls=DjangoJSONEncoder, ensure_ascii=False
+                ) + '\n')
+            total += len(chunk)
+            last_pk = chunk[-1].pk
+    return total
+
+
+def iter_json_array(stream):
+    """Поэлементный разбор JSON-массива без загрузки файла целиком.
+
+    Ожидает поток, из которого уже прочитана открывающая скобка.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            more = stream.read(READ_CHUNK_SIZE)
+            if not more:
+                raise
+            buffer += more
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def iter_records(stream):
+    """Записи из файла JSON Lines или JSON-массива."""
+    first = stream.read(1)
+    while first.isspace():
+        first = stream.read(1)
+    if first == '[':
+        yield from iter_json_array(stream)
+        return
+    line = first + stream.readline()
+    while line:
+        if line.strip():
+            yield json.loads(line)
+        line = stream.readline()
+
+
+def insert_objects(model, objects, ignore_conflicts):
+    """Вставка объектов с сохранением значений как есть.
+
+    В отличие от bulk_create, вставка в режиме raw не перезаписывает
+    поля auto_now_add (как и loaddata) и не отправляет сигналы.
+    """
+    fields = model._meta.concrete_fields
+    batch_size = max(connection.ops.bulk_batch_size(fields, objects), 1)
+    for start in range(0, len(objects), batch_size):
+        model._base_manager._insert(
+            objects[start:start + batch_size],
+            fields=fields,
+            raw=True,
+            ignore_conflicts=ignore_conflicts,
+        )
+
+
+def save_batch(records, ignore_conflicts):
+    """Сохранение пакета записей одной модели; возвращает модель."""
+    deserialized = list(serializers.deserialize(
+        'python', records, ignorenonexistent=True
+    ))
+    model = type(deserialized[0].object)
+    insert_objects(
+        model, [item.object for item in deserialized], ignore_conflicts
+    )
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            continue
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(
+            field.m2m_reverse_field_name()
+        ).attname
+        through._base_manager.bulk_create(
+            (
+                through(**{source: item.object.pk, target: related_pk})
+                for item in deserialized
+                for related_pk in item.m2m_data.get(field.name, ())
+            ),
+            ignore_conflicts=True,
+        )
+    return model
+
+
+def import_records(
+    records,
+    batch_size=1000,
+    commit_every=50000,
+    skip=0,
+    ignore_conflicts=False,
+    on_commit=None,
+    labels=EXPORT_MODELS,
+):
+    """Загрузка записей пакетами с фиксацией каждые commit_every записей.
+
+    Записи моделей не из labels пропускаются. Внутри транзакции проверка
+    внешних ключей отложена до её конца. После каждой фиксации
+    вызывается on_commit с числом записей, пройденных с начала файла,
+    что позволяет продолжить прерванную загрузку. Возвращает это число.
+    """
+    records = islice(records, skip, None)
+    done = skip
+    touched = set()
+    while True:
+        group = list(islice(records, commit_every))
+        if not group:
+            break
+        with transaction.atomic(), connection.constraint_checks_disabled():
+            for label, model_records in groupby(
+                group, key=lambda record: record['model'].lower()
+            ):
+                if label not in labels:
+                    continue
+                model_records = iter(model_records)
+                while True:
+                    batch = list(islice(model_records, batch_size))
+                    if not batch:
+                        break
+                    touched.add(save_batch(batch, ignore_conflicts))
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in touched]
+            )
+        done += len(group)
+        if on_commit is not None:
+            on_commit(done)
+    reset_sequences(touched)
+    return done
+
+
+def reset_sequences(models):
+    """Сдвиг последовательностей первичных ключей после явных вставок."""
+    models = list(models)
+    if not models:
+        return
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def read_checkpoint(path):
+    """Число уже загруженных записей из файла контрольной точки."""
+    try:
+        with open(path, encoding='utf-8') as checkpoint:
+            return json.load(checkpoint)['records']
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, records):
+    """Атомарная запись контрольной точки."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as checkpoint:
+        json.dump({'records': records}, checkpoint)
+    os.replace(temporary, path)
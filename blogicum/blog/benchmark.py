@@ -0,0 +1,129 @@
+"""Замеры задержки, числа запросов и пропускной способности страниц блога."""
+import statistics
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from urllib.request import urlopen
+
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .models import Post
+from .views import get_post_object
+
+Target = namedtuple('Target', ('name', 'method', 'url', 'data'))
+BenchResult = namedtuple(
+    'BenchResult', ('name', 'driver', 'timings', 'elapsed', 'queries')
+)
+
+
+def percentiles(timings):
+    """Перцентили p50, p95 и p99 в миллисекундах."""
+    if len(timings) < 2:
+        value = timings[0] * 1000 if timings else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def format_result(result):
+    """Строка отчёта по одному замеру."""
+    p50, p95, p99 = percentiles(result.timings)
+    rps = len(result.timings) / result.elapsed if result.elapsed else 0
+    queries = (
+        f'{result.queries / len(result.timings):6.1f} q/req'
+        if result.queries is not None else '     - q/req'
+    )
+    return (
+        f'{result.name:<12} {result.driver:<6} {rps:9.1f} req/s  '
+        f'p50 {p50:7.2f} мс  p95 {p95:7.2f} мс  p99 {p99:7.2f} мс  '
+        f'{queries}'
+    )
+
+
+def get_targets():
+    """Адреса всех страниц блога, построенные по данным из базы.
+
+    Для ленты категории и страницы поста берётся пост с наибольшим
+    числом комментариев, для профиля — его автор.
+    """
+    post = get_post_object().select_related(
+        'author', 'category'
+    ).order_by('-comment_count').first()
+    if post is None:
+        return []
+    return [
+        Target('index', 'get', '/', None),
+        Target(
+            'category', 'get', f'/category/{post.category.slug}/', None
+        ),
+        Target('profile', 'get', f'/profile/{post.author.username}/', None),
+        Target('detail', 'get', f'/posts/{post.pk}/', None),
+        Target(
+            'add_comment',
+            'post',
+            f'/posts/{post.pk}/comment/',
+            {'text': 'Комментарий из замера'},
+        ),
+    ]
+
+
+@contextmanager
+def rolled_back():
+    """Транзакция, которая откатывается по выходу из блока."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def run_client(target, iterations, user=None):
+    """Последовательный прогон через тестовый клиент Django.
+
+    Запросы записи выполняются в откатываемой транзакции: созданные
+    замером комментарии не остаются в базе.
+    """
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+    request = getattr(client, target.method)
+    timings = []
+    isolation = nullcontext() if target.method == 'get' else rolled_back()
+    with isolation, CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            request_started = time.perf_counter()
+            response = request(target.url, target.data)
+            timings.append(time.perf_counter() - request_started)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f'{target.url} ответил статусом {response.status_code}'
+                )
+        elapsed = time.perf_counter() - started
+    return BenchResult(
+        target.name, 'client', timings, elapsed, len(queries)
+    )
+
+
+def run_http(base_url, target, iterations, concurrency):
+    """Параллельный прогон GET-запросов к запущенному серверу."""
+    url = base_url.rstrip('/') + target.url
+
+    def call(_):
+        started = time.perf_counter()
+        with urlopen(url) as response:
+            response.read()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        timings = list(executor.map(call, range(iterations)))
+    elapsed = time.perf_counter() - started
+    return BenchResult(target.name, 'http', timings, elapsed, None)
+
+
+def get_bench_user():
+    """Пользователь, от имени которого выполняются запросы записи."""
+    post = Post.objects.select_related('author').first()
+    return post.author if post else None
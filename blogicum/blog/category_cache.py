@@ -0,0 +1,63 @@
+"""Кэш опубликованных категорий в памяти процесса.
+
+Таблица слаг → категория загружается целиком и хранится в процессе,
+пока не сменится версия в общем кэше. Сохранение и удаление категории
+меняет версию, и каждый процесс, разделяющий этот кэш (Redis,
+Memcached), перечитывает таблицу при следующем запросе. Проверка
+версии — одно обращение к кэшу вместо запроса к базе. Кэш в памяти
+процесса (LocMem по умолчанию) не передаёт смену версии другим
+процессам, поэтому таблица перечитывается и по истечении
+CATEGORY_CACHE_MAX_AGE секунд.
+"""
+import time
+import uuid
+
+from django.core.cache import cache
+from django.http import Http404
+
+from .constants import CATEGORY_CACHE_MAX_AGE
+from .models import Category
+
+VERSION_KEY = 'blog:categories:version'
+
+_loaded = (None, 0, {})
+
+
+def bump_version():
+    """Смена версии: процессы перечитают категории."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_version():
+    """Текущая версия; заводится, если её нет или она вытеснена."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_published_categories():
+    """Опубликованные категории по слагу."""
+    global _loaded
+    version = get_version()
+    now = time.monotonic()
+    loaded_version, loaded_at, categories = _loaded
+    if (
+        loaded_version != version
+        or now - loaded_at >= CATEGORY_CACHE_MAX_AGE
+    ):
+        categories = {
+            category.slug: category
+            for category in Category.objects.filter(is_published=True)
+        }
+        _loaded = (version, now, categories)
+    return categories
+
+
+def get_published_category(slug):
+    """Опубликованная категория по слагу или ошибка 404."""
+    category = get_published_categories().get(slug)
+    if category is None:
+        raise Http404('Категория не найдена.')
+    return category
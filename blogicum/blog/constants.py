@@ -1,3 +1,64 @@
 """Константы приложения блог."""
 TITLE_MAX_LENGTH = 30
+# Число слов в отрывке публикации для карточек ленты.
+EXCERPT_WORDS = 10
 POSTS_ON_PAGE = 10
+# Подпись места у публикаций без опубликованного местоположения.
+DEFAULT_LOCATION_LABEL = 'Планета Земля'
+# Начиная с этого числа строк в таблице админка берёт оценку из
+# статистики базы данных вместо COUNT(*).
+ESTIMATED_COUNT_THRESHOLD = 10000
+# Время жизни закэшированного размера ленты, в секундах.
+FEED_COUNT_TIMEOUT = 60 * 5
+# Бюджеты записи на пользователя: (число запросов, период в секундах).
+RATE_LIMITS = {
+    'create_post': (10, 60),
+    'add_comment': (20, 60),
+}
+RATE_LIMIT_CACHE = 'default'
+# Время жизни закэшированной шапки профиля, в секундах; записи
+# пользователя сбрасывают её сразу.
+PROFILE_HEADER_CACHE_TIMEOUT = 60 * 10
+# Наибольший возраст таблицы опубликованных категорий в памяти
+# процесса, в секундах.
+CATEGORY_CACHE_MAX_AGE = 60
+# Ссылок на страницы по обе стороны от текущей и у краёв ленты.
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+# Записей в одной пачке фонового удаления: каждая пачка — отдельная
+# короткая транзакция.
+REAP_BATCH_SIZE = 500
+# Буфер просмотров: запись в базу раз в столько секунд или при таком
+# числе публикаций в буфере.
+VIEW_FLUSH_INTERVAL = 10
+VIEW_BUFFER_MAX_POSTS = 1000
+# Точность скетча уникальных читателей: 2**HLL_PRECISION байт на скетч,
+# стандартная ошибка около 3%.
+HLL_PRECISION = 10
+# Рейтинг обсуждаемых публикаций: вклад комментария убывает вдвое
+# за TRENDING_HALF_LIFE секунд; в ленте публикации с рейтингом не ниже
+# TRENDING_MIN_SCORE. Пересчёт учитывает комментарии за TRENDING_WINDOW
+# секунд, более старые вносят пренебрежимо малый вклад.
+TRENDING_HALF_LIFE = 60 * 60 * 6
+TRENDING_MIN_SCORE = 0.25
+TRENDING_WINDOW = 60 * 60 * 24 * 7
+# Похожие публикации: соседей на публикацию, наименьшая близость,
+# границы документной частоты слов (число документов и доля).
+RELATED_POSTS = 5
+RELATED_MIN_SCORE = 0.05
+RELATED_MIN_DF = 2
+RELATED_MAX_DF = 0.3
+# Память на блок при расчёте близости: ячеек плотной матрицы
+# и попаданий в инвертированный индекс.
+RELATED_CHUNK_CELLS = 2 ** 22
+RELATED_CHUNK_HITS = 2 ** 23
+# Поиск почти одинаковых текстов: подпись MinHash из
+# MINHASH_BANDS * MINHASH_ROWS значений по шинглам из
+# MINHASH_SHINGLE_WORDS слов. Публикация отмечается как дубликат при
+# оценке сходства не ниже DUPLICATE_THRESHOLD; из одной корзины LSH
+# проверяется не больше MINHASH_MAX_CANDIDATES публикаций.
+MINHASH_BANDS = 20
+MINHASH_ROWS = 5
+MINHASH_SHINGLE_WORDS = 3
+MINHASH_MAX_CANDIDATES = 50
+DUPLICATE_THRESHOLD = 0.8
@@ -0,0 +1,126 @@
+"""Удаление публикаций и пользователей в два этапа.
+
+Объект скрывается сразу: публикация получает отметку `deleted_at`,
+пользователь теряет доступ к сайту и страницу профиля. Зависимые
+записи затем удаляет команда `reap_deleted` пачками ограниченного
+размера, каждую в своей короткой транзакции, и отмечает ход работы
+в `DeletionTask`. Так удаление популярной публикации не держит
+блокировку базы, пока сборщик каскада загружает все комментарии.
+"""
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .feed_counts import invalidate_feed_counts
+from .models import Comment, DeletionTask, Post
+from .stats import change_stats, refresh_user_stats
+
+
+User = get_user_model()
+
+
+def get_pending_user_ids():
+    """Подзапрос id пользователей, ожидающих удаления."""
+    return DeletionTask.objects.filter(
+        kind=DeletionTask.USER, finished_at__isnull=True,
+    ).values('object_id')
+
+
+def get_visible_users():
+    """Пользователи, кроме ожидающих удаления."""
+    return User.objects.exclude(pk__in=get_pending_user_ids())
+
+
+def get_visible_comments():
+    """Комментарии, кроме написанных пользователями в очереди удаления.
+
+    Комментарии удаляемого пользователя к чужим публикациям скрываются
+    вместе с его профилем, а удаляет их потом `reap_deleted`.
+    """
+    return Comment.objects.exclude(author__in=get_pending_user_ids())
+
+
+def discount_comments(comments):
+    """Вычет скрываемых комментариев из статистики их авторов."""
+    totals = Counter(comments.values_list('author_id', flat=True))
+    for author_id, total in totals.items():
+        change_stats(author_id, comment_count=-total)
+
+
+def soft_delete_post(post):
+    """Скрытие публикации и постановка её в очередь на удаление."""
+    with transaction.atomic():
+        post.deleted_at = timezone.now()
+        post.save(update_fields=['deleted_at'])
+        discount_comments(Comment.objects.filter(post=post))
+        DeletionTask.objects.create(
+            kind=DeletionTask.POST, object_id=post.pk
+        )
+
+
+def soft_delete_user(user):
+    """Отключение пользователя и скрытие его публикаций и комментариев."""
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        posts = Post.objects.filter(author=user)
+        discount_comments(Comment.objects.filter(post__in=posts))
+        posts.update(deleted_at=timezone.now())
+        refresh_user_stats([user.pk])
+        DeletionTask.objects.create(
+            kind=DeletionTask.USER, object_id=user.pk
+        )
+    invalidate_feed_counts()
+
+
+def delete_comment_batch(comments, batch_size):
+    """Удаление пачки комментариев без загрузки объектов.
+
+    Комментарии к скрытым публикациям уже вычтены из статистики,
+    поэтому сигналы не нужны.
+    """
+    ids = list(
+        comments.order_by().values_list('pk', flat=True)[:batch_size]
+    )
+    batch = Comment.objects.filter(pk__in=ids)
+    return batch._raw_delete(batch.db)
+
+
+def reap_step(task, batch_size):
+    """Одна пачка работы по задаче; False, когда задача завершена.
+
+    Сначала удаляются комментарии, затем публикации и сам объект,
+    поэтому сборщик каскада на последнем шаге почти ничего не грузит.
+    """
+    if task.kind == DeletionTask.POST:
+        comments = Comment.objects.filter(post_id=task.object_id)
+        posts = Post.all_objects.filter(pk=task.object_id)
+        owner = None
+    else:
+        comments = Comment.objects.filter(
+            Q(author_id=task.object_id) | Q(post__author_id=task.object_id)
+        )
+        posts = Post.all_objects.filter(author_id=task.object_id)
+        owner = User.objects.filter(pk=task.object_id)
+    with transaction.atomic():
+        deleted = delete_comment_batch(comments, batch_size)
+        if deleted:
+            task.comments_deleted += deleted
+            task.save(update_fields=['comments_deleted'])
+            return True
+        post_ids = list(
+            posts.order_by().values_list('pk', flat=True)[:batch_size]
+        )
+        if post_ids:
+            _, deleted = Post.all_objects.filter(pk__in=post_ids).delete()
+            task.posts_deleted += deleted.get(Post._meta.label, 0)
+            task.save(update_fields=['posts_deleted'])
+            return True
+        if owner is not None:
+            owner.delete()
+        task.finished_at = timezone.now()
+        task.save(update_fields=['finished_at'])
+    return False
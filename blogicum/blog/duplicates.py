@@ -0,0 +1,92 @@
+"""Отметка почти одинаковых публикаций по подписям MinHash.
+
+Подпись и ключи корзин LSH считаются при сохранении текста. Кандидаты
+в оригиналы — публикации из тех же корзин: один запрос по индексу
+ключей, а не сравнение с каждым текстом. Из кандидатов выбирается
+самая похожая по подписи, а при равном сходстве — самая ранняя.
+Публикация только отмечается для модераторов и не отклоняется:
+сходство оценочное, а повторы бывают и у добросовестных авторов.
+"""
+from django.db import transaction
+
+from .constants import DUPLICATE_THRESHOLD, MINHASH_MAX_CANDIDATES
+from .minhash import (
+    get_band_keys, get_signature, get_similarity, load_signature,
+)
+from .models import FingerprintBucket, Post, PostFingerprint
+
+
+def find_original(post_id, signature, keys):
+    """Id публикации, копией которой выглядит текст, или None."""
+    candidates = (
+        FingerprintBucket.objects.filter(key__in=keys)
+        .exclude(post_id=post_id)
+        .order_by('post_id')
+        .values('post_id')
+        .distinct()[:MINHASH_MAX_CANDIDATES]
+    )
+    scored = [
+        (get_similarity(signature, load_signature(stored)), -pk)
+        for pk, stored in PostFingerprint.objects.filter(
+            post_id__in=candidates
+        ).values_list('post_id', 'signature')
+    ]
+    similarity, original = max(scored, default=(0, None))
+    if similarity < DUPLICATE_THRESHOLD:
+        return None
+    return -original
+
+
+def fingerprint_post(post, created=False):
+    """Подпись и корзины публикации; id оригинала или None.
+
+    Для новой публикации старые подписи и корзины не ищутся, а при
+    сохранении без изменения текста подпись остаётся прежней.
+    """
+    signature = get_signature(post.text)
+    if not created:
+        stored = PostFingerprint.objects.filter(post=post).values_list(
+            'signature', 'duplicate_of_id'
+        ).first()
+        if stored and signature is not None and (
+            bytes(stored[0]) == signature.tobytes()
+        ):
+            return stored[1]
+    with transaction.atomic():
+        if not created:
+            FingerprintBucket.objects.filter(post=post).delete()
+            PostFingerprint.objects.filter(post=post).delete()
+        if signature is None:
+            return None
+        keys = get_band_keys(signature)
+        original = find_original(post.pk, signature, keys)
+        PostFingerprint.objects.create(
+            post=post,
+            signature=signature.tobytes(),
+            duplicate_of_id=original,
+        )
+        FingerprintBucket.objects.bulk_create(
+            FingerprintBucket(post=post, key=key) for key in keys
+        )
+    return original
+
+
+def fingerprint_missing(batch_size=500):
+    """Подписи публикаций без подписи по возрастанию id; их число.
+
+    Ранние публикации получают подпись первыми, поэтому копией
+    отмечается более поздний текст.
+    """
+    posts = Post.all_objects.filter(
+        fingerprint__isnull=True
+    ).order_by('pk').only('pk', 'text')
+    done = 0
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:batch_size])
+        if not chunk:
+            return done
+        for post in chunk:
+            fingerprint_post(post, created=True)
+        done += len(chunk)
+        last_pk = chunk[-1].pk
@@ -0,0 +1,97 @@
+"""Закэшированные размеры лент для постраничной навигации.
+
+Ленты: главная (`index`), категории (`category:<id>`), профиль для
+посетителей (`author:<id>`) и для самого автора (`author:<id>:all`).
+Сохранение и удаление публикации меняет счётчики затронутых лент на
+единицу; публикации с отметкой об удалении не входят ни в одну ленту.
+Массовые изменения и правка категорий меняют версию, после чего все
+счётчики считаются заново. Публикации, чья дата наступила
+без записи в базу, попадают в счётчик по истечении FEED_COUNT_TIMEOUT.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .category_cache import get_published_categories
+
+VERSION_KEY = 'blog:feed-count:version'
+
+FEED_FIELDS = (
+    'is_published', 'pub_date', 'category_id', 'author_id', 'deleted_at'
+)
+
+
+INDEX_FEED = 'index'
+
+# Состав ленты обсуждаемого меняется со временем без записи в базу,
+# её размер обновляется только по истечении FEED_COUNT_TIMEOUT.
+TRENDING_FEED = 'trending'
+
+
+def get_category_feed(category_id):
+    """Имя ленты категории."""
+    return f'category:{category_id}'
+
+
+def get_author_feed(author_id, show_hidden=False):
+    """Имя ленты профиля: для посетителей или для самого автора."""
+    return f'author:{author_id}:all' if show_hidden else f'author:{author_id}'
+
+
+def get_count_key(feed):
+    """Ключ счётчика ленты в текущей версии."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return f'blog:feed-count:{version}:{feed}'
+
+
+def invalidate_feed_counts():
+    """Сброс всех счётчиков сменой версии."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_feed_fields(post):
+    """Поля публикации, от которых зависят её ленты.
+
+    None, если какое-то из них не загружено.
+    """
+    if any(name not in post.__dict__ for name in FEED_FIELDS):
+        return None
+    return tuple(post.__dict__[name] for name in FEED_FIELDS)
+
+
+def get_post_feeds(feed_fields):
+    """Ленты, в которых сейчас учитывается публикация с такими полями."""
+    (
+        is_published, pub_date, category_id, author_id, deleted_at
+    ) = feed_fields
+    if deleted_at is not None:
+        return set()
+    feeds = {get_author_feed(author_id, show_hidden=True)}
+    published_ids = {
+        category.pk for category in get_published_categories().values()
+    }
+    if (
+        is_published
+        and pub_date is not None
+        and pub_date <= timezone.now()
+        and category_id in published_ids
+    ):
+        feeds.update((
+            INDEX_FEED,
+            get_category_feed(category_id),
+            get_author_feed(author_id),
+        ))
+    return feeds
+
+
+def change_feed_counts(feeds, delta):
+    """Изменение закэшированных счётчиков; отсутствующие не заводятся."""
+    for feed in feeds:
+        try:
+            cache.incr(get_count_key(feed), delta)
+        except ValueError:
+            pass
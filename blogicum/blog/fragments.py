@@ -0,0 +1,47 @@
+"""Ответы-фрагменты для запросов комментариев из JavaScript.
+
+Запрос с заголовком `Accept: application/json` получает JSON,
+запрос с `X-Requested-With: XMLHttpRequest` — HTML-фрагмент
+комментария. Остальные запросы обрабатываются как раньше,
+с переходом на страницу публикации.
+"""
+from http import HTTPStatus
+
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+
+COMMENT_TEMPLATE = 'includes/comment.html'
+
+
+def get_fragment_format(request):
+    """Формат ответа: 'json', 'html' или None для полной страницы."""
+    if 'application/json' in request.headers.get('Accept', ''):
+        return 'json'
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return 'html'
+    return None
+
+
+def render_comment(request, comment, fragment, status=HTTPStatus.OK):
+    """Разметка комментария для вставки в список на странице."""
+    html = render_to_string(COMMENT_TEMPLATE, {'comment': comment}, request)
+    if fragment == 'json':
+        return JsonResponse({'id': comment.pk, 'html': html}, status=status)
+    return HttpResponse(html, status=status)
+
+
+def render_form_errors(form, fragment):
+    """Ошибки формы комментария."""
+    if fragment == 'json':
+        return JsonResponse(
+            {'errors': form.errors.get_json_data()},
+            status=HTTPStatus.BAD_REQUEST,
+        )
+    return HttpResponse(form.errors.as_ul(), status=HTTPStatus.BAD_REQUEST)
+
+
+def render_deleted(comment_id, fragment):
+    """Подтверждение удаления комментария."""
+    if fragment == 'json':
+        return JsonResponse({'id': comment_id, 'deleted': True})
+    return HttpResponse(status=HTTPStatus.NO_CONTENT)
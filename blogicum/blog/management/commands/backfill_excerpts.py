@@ -0,0 +1,58 @@
+"""Заполнение отрывков публикаций."""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from blog.models import Post, make_excerpt
+
+
+def save_excerpts(posts):
+    """Запись отрывков порции через executemany.
+
+    bulk_update строит один CASE на всю порцию и на SQLite работает
+    в десятки раз медленнее.
+    """
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f'UPDATE {quote(Post._meta.db_table)} '
+            f'SET {quote("excerpt")} = %s WHERE {quote("id")} = %s',
+            [(make_excerpt(post.text), post.pk) for post in posts],
+        )
+
+
+class Command(BaseCommand):
+    """Команда пересчёта отрывков для карточек ленты."""
+
+    help = (
+        'Заполняет отрывки публикаций, добавленных в обход save() '
+        '(loaddata, import_blog). С --all пересчитывает все отрывки, '
+        'например после изменения EXCERPT_WORDS.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать и уже заполненные отрывки.',
+        )
+
+    def handle(self, *args, **options):
+        """Пересчёт отрывков порциями по первичному ключу."""
+        posts = Post.objects.only('text').order_by('pk')
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+        last_pk = 0
+        total = 0
+        while True:
+            chunk = list(
+                posts.filter(pk__gt=last_pk)[:options['batch_size']]
+            )
+            if not chunk:
+                break
+            save_excerpts(chunk)
+            total += len(chunk)
+            last_pk = chunk[-1].pk
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено отрывков: {total}'
+        ))
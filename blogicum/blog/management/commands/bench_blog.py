@@ -0,0 +1,82 @@
+"""Нагрузочный прогон всех страниц блога."""
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from blog.benchmark import (
+    format_result, get_bench_user, get_targets, run_client, run_http
+)
+from blog.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    """Команда замера задержки, числа запросов и req/s."""
+
+    help = (
+        'Замеряет ленту, категорию, профиль, страницу поста и добавление '
+        'комментария через тестовый клиент и, при указании --base-url, '
+        'параллельными HTTP-запросами к запущенному серверу.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            '--seed', action='store_true',
+            help='Перед замером заполнить базу синтетическими данными.',
+        )
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=5000)
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--base-url',
+            help='Адрес запущенного сервера для HTTP-прогона.',
+        )
+
+    def handle(self, *args, **options):
+        """Заполнение базы и прогон каждой страницы."""
+        if options['seed']:
+            seed_dataset(
+                users=options['users'],
+                categories=options['categories'],
+                locations=options['locations'],
+                posts=options['posts'],
+                comments=options['comments'],
+            )
+        targets = get_targets()
+        if not targets:
+            raise CommandError(
+                'Нет опубликованных постов: запустите команду с --seed.'
+            )
+        user = get_bench_user()
+        metrics_logger = logging.getLogger('blogicum.metrics')
+        level = metrics_logger.level
+        metrics_logger.setLevel(logging.WARNING)
+        # Замеряется сама вью, а не ограничитель частоты записи.
+        unlimited = {
+            'create_post': (10 ** 9, 1),
+            'add_comment': (10 ** 9, 1),
+        }
+        try:
+            with override_settings(
+                BLOG_RATE_LIMITS=unlimited,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            ):
+                for target in targets:
+                    self.stdout.write(format_result(
+                        run_client(target, options['iterations'], user)
+                    ))
+                    if options['base_url'] and target.method == 'get':
+                        self.stdout.write(format_result(run_http(
+                            options['base_url'],
+                            target,
+                            options['iterations'],
+                            options['concurrency'],
+                        )))
+        finally:
+            metrics_logger.setLevel(level)
@@ -0,0 +1,33 @@
+"""Расчёт похожих публикаций."""
+from django.core.management.base import BaseCommand
+
+from blog.related import build_related_posts
+
+
+class Command(BaseCommand):
+    """Команда расчёта соседей публикаций по TF-IDF."""
+
+    help = (
+        'Строит модель TF-IDF по заголовкам и текстам опубликованных '
+        'публикаций и сохраняет ближайших соседей каждой. С --new-only '
+        'считает соседей только для публикаций без списка и добавляет '
+        'их в списки соседей; запускается по расписанию между полными '
+        'пересчётами.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--new-only', action='store_true',
+            help='Только публикации, для которых соседи ещё не считались.',
+        )
+
+    def handle(self, *args, **options):
+        """Расчёт и сохранение соседей."""
+        updated = build_related_posts(
+            new_only=options['new_only'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено списков похожих публикаций: {updated}'
+        ))
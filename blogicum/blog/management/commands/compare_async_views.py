@@ -0,0 +1,149 @@
+"""Сравнение WSGI- и ASGI-путей страниц блога под нагрузкой."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from types import ModuleType
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+
+from blog import async_views, views
+from blog.benchmark import percentiles
+from blog.urls import get_urlpatterns
+from blog.views import get_post_object
+
+
+def get_urlconf(feed_views):
+    """Адреса сайта, где ленты и страница публикации из feed_views."""
+    root = import_module(settings.ROOT_URLCONF)
+    blog = path('', include((get_urlpatterns(feed_views), 'blog')))
+    urlconf = ModuleType(f'{__name__}.{feed_views.__name__}_urls')
+    urlconf.urlpatterns = [blog] + [
+        pattern for pattern in root.urlpatterns
+        if getattr(pattern, 'app_name', None) != 'blog'
+    ]
+    urlconf.handler404 = root.handler404
+    urlconf.handler500 = root.handler500
+    return urlconf
+
+
+def get_middleware():
+    """Мидлвары проекта без панели отладки.
+
+    Панель работает только синхронно и рисуется для внутренних
+    адресов, с которых идут запросы тестовых клиентов.
+    """
+    return [
+        name for name in settings.MIDDLEWARE if not name.startswith(
+            'debug_toolbar.'
+        )
+    ]
+
+
+class Command(BaseCommand):
+    """Команда сравнения WSGI и ASGI вариантов страниц."""
+
+    help = (
+        'Прогоняет ленту, категорию, профиль и страницу публикации '
+        'через обработчики Django со всеми мидлварами: синхронные вью '
+        'через Client из пула потоков, как под WSGI-сервером, '
+        'асинхронные через AsyncClient в одном цикле событий, как под '
+        'ASGI-сервером. Сравнивает пропускную способность и задержки.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=10)
+
+    def handle(self, *args, **options):
+        """Запуск сравнения для каждой страницы."""
+        total = options['requests']
+        concurrency = options['concurrency']
+        client_settings = {
+            'MIDDLEWARE': get_middleware(),
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+        }
+        for name, url in self.get_targets():
+            with override_settings(
+                ROOT_URLCONF=get_urlconf(views), **client_settings
+            ):
+                sync_timings, sync_elapsed = self.run_sync(
+                    url, total, concurrency
+                )
+            with override_settings(
+                ROOT_URLCONF=get_urlconf(async_views), **client_settings
+            ):
+                async_timings, async_elapsed = asyncio.run(
+                    self.run_async(url, total, concurrency)
+                )
+            self.report(name, 'wsgi', sync_timings, sync_elapsed)
+            self.report(name, 'asgi', async_timings, async_elapsed)
+
+    def get_targets(self):
+        """Адреса для сравнения, построенные по данным из базы."""
+        post = get_post_object().select_related('author', 'category').first()
+        if post is None:
+            raise CommandError(
+                'Нет опубликованных постов: заполните базу перед сравнением.'
+            )
+        return (
+            ('index', '/'),
+            ('category', f'/category/{post.category.slug}/'),
+            ('profile', f'/profile/{post.author.username}/'),
+            ('detail', f'/posts/{post.pk}/'),
+        )
+
+    def check_response(self, response, url):
+        """Остановка сравнения, если страница не отдалась."""
+        if response.status_code != 200:
+            raise CommandError(f'{url}: статус {response.status_code}')
+
+    def run_sync(self, url, total, concurrency):
+        """Нагрузка синхронного обработчика из пула потоков."""
+        local = threading.local()
+
+        def call(_):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            started = time.perf_counter()
+            response = local.client.get(url)
+            elapsed = time.perf_counter() - started
+            self.check_response(response, url)
+            return elapsed
+
+        call(None)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            timings = list(executor.map(call, range(total)))
+        return timings, time.perf_counter() - started
+
+    async def run_async(self, url, total, concurrency):
+        """Нагрузка асинхронного обработчика из одного цикла событий."""
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                elapsed = time.perf_counter() - started
+                self.check_response(response, url)
+                return elapsed
+
+        await call()
+        started = time.perf_counter()
+        timings = await asyncio.gather(*(call() for _ in range(total)))
+        return timings, time.perf_counter() - started
+
+    def report(self, name, mode, timings, elapsed):
+        """Вывод строки отчёта."""
+        p50, p95, p99 = percentiles(timings)
+        self.stdout.write(
+            f'{name:<9} {mode:<5} {len(timings) / elapsed:9.1f} req/s  '
+            f'p50 {p50:7.2f} мс  p95 {p95:7.2f} мс  p99 {p99:7.2f} мс'
+        )
@@ -0,0 +1,39 @@
+"""Потоковая выгрузка данных блога в JSON Lines."""
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.backup import EXPORT_MODELS, export_records
+
+
+class Command(BaseCommand):
+    """Команда выгрузки данных блога."""
+
+    help = (
+        'Выгружает данные блога в файл JSON Lines порциями, '
+        'не загружая таблицы в память целиком.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            'output', help='Путь к файлу или «-» для стандартного вывода.'
+        )
+        parser.add_argument(
+            '--models', nargs='+', default=list(EXPORT_MODELS),
+            help='Модели в порядке зависимостей, например blog.post.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        """Выгрузка в файл или стандартный вывод."""
+        if options['output'] == '-':
+            total = export_records(
+                sys.stdout, options['models'], options['chunk_size']
+            )
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                total = export_records(
+                    stream, options['models'], options['chunk_size']
+                )
+        self.stderr.write(f'Выгружено записей: {total}')
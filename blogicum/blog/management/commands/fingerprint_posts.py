@@ -0,0 +1,25 @@
+"""Подписи MinHash публикаций без подписи."""
+from django.core.management.base import BaseCommand
+
+from blog.duplicates import fingerprint_missing
+
+
+class Command(BaseCommand):
+    """Команда расчёта подписей и отметки почти одинаковых публикаций."""
+
+    help = (
+        'Считает подписи MinHash и корзины LSH для публикаций, '
+        'вставленных без save(), и отмечает почти одинаковые. '
+        'Запускается после loaddata и import_blog.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        """Расчёт подписей."""
+        done = fingerprint_missing(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Подписано публикаций: {done}'
+        ))
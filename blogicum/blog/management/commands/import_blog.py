@@ -0,0 +1,75 @@
+"""Потоковая загрузка данных блога из JSON Lines или db.json."""
+import os
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog.backup import (
+    import_records, iter_records, read_checkpoint, write_checkpoint
+)
+from blog.feed_counts import invalidate_feed_counts
+from blog.stats import refresh_user_stats
+
+
+class Command(BaseCommand):
+    """Команда загрузки данных пакетами с возможностью продолжения."""
+
+    help = (
+        'Загружает записи из файла JSON Lines или JSON-массива пакетами '
+        'через вставку без сигналов, фиксируя транзакцию каждые '
+        '--commit-every записей. Прерванную загрузку можно продолжить '
+        'с флагом --resume. Загружаются пользователи и модели блога, '
+        'остальные записи пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('input', help='Путь к файлу выгрузки.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--commit-every', type=int, default=50000)
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить с последней контрольной точки.',
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help=(
+                'Пропускать записи, уже существующие в базе, оставляя '
+                'их без изменений.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Загрузка с записью контрольных точек."""
+        checkpoint = f'{options["input"]}.checkpoint'
+        skip = read_checkpoint(checkpoint) if options['resume'] else 0
+        if skip:
+            self.stdout.write(f'Продолжение с записи {skip}')
+
+        def on_commit(done):
+            write_checkpoint(checkpoint, done)
+            self.stdout.write(f'Загружено записей: {done}')
+
+        with open(options['input'], encoding='utf-8') as stream:
+            total = import_records(
+                iter_records(stream),
+                batch_size=options['batch_size'],
+                commit_every=options['commit_every'],
+                skip=skip,
+                # Последняя порция до сбоя могла успеть зафиксироваться.
+                ignore_conflicts=options['ignore_conflicts'] or bool(skip),
+                on_commit=on_commit,
+            )
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        # Вставка без сигналов и save() не обновляет статистику
+        # пользователей, рейтинг обсуждения, подписи MinHash и отрывки
+        # публикаций из старых выгрузок.
+        refresh_user_stats()
+        invalidate_feed_counts()
+        call_command('backfill_excerpts', stdout=self.stdout)
+        call_command('rescore_trending', stdout=self.stdout)
+        call_command('fingerprint_posts', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена, записей: {total}'
+        ))
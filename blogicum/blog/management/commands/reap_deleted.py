@@ -0,0 +1,48 @@
+"""Удаление скрытых публикаций и пользователей."""
+from django.core.management.base import BaseCommand
+
+from blog.constants import REAP_BATCH_SIZE
+from blog.deletion import reap_step
+from blog.models import DeletionTask
+
+
+class Command(BaseCommand):
+    """Команда фонового удаления зависимых записей пачками."""
+
+    help = (
+        'Удаляет комментарии, публикации и пользователей из очереди '
+        'задач удаления пачками, каждую в отдельной транзакции. '
+        'Запускается по расписанию; прерванная работа продолжается '
+        'при следующем запуске.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            '--batch-size', type=int, default=REAP_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--max-batches', type=int, default=None,
+            help='Остановиться после заданного числа пачек.',
+        )
+
+    def handle(self, *args, **options):
+        """Выполнение задач по очереди."""
+        batches = 0
+        tasks = DeletionTask.objects.filter(finished_at__isnull=True)
+        for task in tasks:
+            while options['max_batches'] is None or (
+                batches < options['max_batches']
+            ):
+                batches += 1
+                if not reap_step(task, options['batch_size']):
+                    self.stdout.write(
+                        f'{task}: удалено публикаций {task.posts_deleted}, '
+                        f'комментариев {task.comments_deleted}'
+                    )
+                    break
+            else:
+                break
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано пачек: {batches}'
+        ))
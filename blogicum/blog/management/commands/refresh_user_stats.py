@@ -0,0 +1,25 @@
+"""Пересчёт статистики пользователей."""
+from django.core.management.base import BaseCommand
+
+from blog.stats import refresh_user_stats
+
+
+class Command(BaseCommand):
+    """Команда пересчёта счётчиков публикаций и комментариев."""
+
+    help = (
+        'Пересчитывает статистику пользователей по их публикациям и '
+        'комментариям, например после loaddata.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            'user_ids', nargs='*', type=int,
+            help='Идентификаторы пользователей; по умолчанию все.',
+        )
+
+    def handle(self, *args, **options):
+        """Пересчёт статистики."""
+        refresh_user_stats(options['user_ids'] or None)
+        self.stdout.write(self.style.SUCCESS('Статистика пересчитана'))
@@ -0,0 +1,22 @@
+"""Пересчёт рейтинга обсуждаемых публикаций."""
+from django.core.management.base import BaseCommand
+
+from blog.trending import rescore_trending
+
+
+class Command(BaseCommand):
+    """Команда пересчёта рейтингов по свежим комментариям."""
+
+    help = (
+        'Пересчитывает рейтинг обсуждения по комментариям за '
+        'TRENDING_WINDOW и сбрасывает угасшие рейтинги. Запускается '
+        'по расписанию, а также после удаления комментариев, '
+        'loaddata и import_blog.'
+    )
+
+    def handle(self, *args, **options):
+        """Пересчёт рейтингов."""
+        total = rescore_trending()
+        self.stdout.write(self.style.SUCCESS(
+            f'Публикаций в ленте обсуждаемого: {total}'
+        ))
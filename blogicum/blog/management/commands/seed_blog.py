@@ -0,0 +1,97 @@
+"""Заполнение базы большим объёмом синтетических данных."""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    """Команда генерации пользователей, постов и комментариев."""
+
+    help = (
+        'Генерирует посты и комментарии с реалистичными распределениями '
+        'и вставляет их пакетами через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=300000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Число процессов, генерирующих строки.',
+        )
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--scheduled-share', type=float, default=0.02)
+        parser.add_argument('--hidden-share', type=float, default=0.02)
+        parser.add_argument(
+            '--unpublished-category-share', type=float, default=0.1
+        )
+
+    def validate(self, options):
+        """Проверка объёмов и долей до начала вставки."""
+        for name in ('users', 'categories', 'locations', 'posts', 'comments'):
+            if options[name] < 0:
+                raise CommandError(f'--{name}: ожидается число не меньше 0.')
+        for name in ('batch_size', 'workers'):
+            if options[name] < 1:
+                raise CommandError(
+                    f'--{name.replace("_", "-")}: ожидается число больше 0.'
+                )
+        if options['posts']:
+            for name in ('users', 'categories', 'locations'):
+                if not options[name]:
+                    raise CommandError(
+                        f'--{name}: для постов нужна хотя бы одна запись.'
+                    )
+        for name in (
+            'scheduled_share', 'hidden_share', 'unpublished_category_share'
+        ):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(
+                    f'--{name.replace("_", "-")}: ожидается доля от 0 до 1.'
+                )
+
+    def handle(self, *args, **options):
+        """Генерация данных с выводом прогресса."""
+        self.validate(options)
+        started = time.perf_counter()
+        last_report = {}
+
+        def progress(model, done, total):
+            name = model._meta.model_name
+            if done == total or time.perf_counter() - last_report.get(
+                name, 0
+            ) > 5:
+                last_report[name] = time.perf_counter()
+                self.stdout.write(
+                    f'{name}: {done}/{total} '
+                    f'({time.perf_counter() - started:.1f} с)'
+                )
+
+        prefix = seed_dataset(
+            users=options['users'],
+            categories=options['categories'],
+            locations=options['locations'],
+            posts=options['posts'],
+            comments=options['comments'],
+            batch_size=options['batch_size'],
+            workers=max(1, min(options['workers'], os.cpu_count() or 1)),
+            seed=options['seed'],
+            scheduled_share=options['scheduled_share'],
+            hidden_share=options['hidden_share'],
+            unpublished_category_share=options[
+                'unpublished_category_share'
+            ],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.perf_counter() - started:.1f} с, '
+            f'префикс пользователей и категорий: {prefix}'
+        ))
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:19
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.db.models.deletion
+
+
+def fill_user_stats(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserStats = apps.get_model('blog', 'UserStats')
+    totals = {}
+    for model_name, field in (
+        ('Post', 'post_count'), ('Comment', 'comment_count')
+    ):
+        rows = apps.get_model('blog', model_name).objects.values(
+            'author'
+        ).annotate(total=Count('pk'), last=Max('created_at')).order_by()
+        for row in rows:
+            stats = totals.setdefault(
+                row['author'], UserStats(user_id=row['author'])
+            )
+            setattr(stats, field, row['total'])
+            stats.last_activity = max(
+                filter(None, (stats.last_activity, row['last']))
+            )
+    UserStats.objects.bulk_create(
+        totals.get(pk) or UserStats(user_id=pk)
+        for pk in User.objects.values_list('pk', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0003_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Пользователь')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'статистика пользователя',
+                'verbose_name_plural': 'Статистика пользователей',
+            },
+        ),
+        migrations.RunPython(fill_user_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:25
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+# Копия blog.models.make_excerpt на момент миграции: историческая
+# миграция не должна зависеть от текущего кода моделей.
+EXCERPT_WORDS = 10
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('text').order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:2000])
+        if not chunk:
+            break
+        quote = schema_editor.connection.ops.quote_name
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {quote(Post._meta.db_table)} '
+                f'SET {quote("excerpt")} = %s WHERE {quote("id")} = %s',
+                [(make_excerpt(post.text), post.pk) for post in chunk],
+            )
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_author_published_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Отрывок'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
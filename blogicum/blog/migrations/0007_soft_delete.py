@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Публикация'), ('user', 'Пользователь')], max_length=4, verbose_name='Объект')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Идентификатор объекта')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+                ('comments_deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено комментариев')),
+                ('posts_deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено публикаций')),
+            ],
+            options={
+                'verbose_name': 'задача удаления',
+                'verbose_name_plural': 'Задачи удаления',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Удалено'),
+        ),
+        migrations.AddIndex(
+            model_name='deletiontask',
+            index=models.Index(fields=['kind', 'object_id'], name='deletion_task_object_idx'),
+        ),
+    ]
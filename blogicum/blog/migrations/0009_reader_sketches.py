@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostReaders',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reader_sketch', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('sketch', models.BinaryField(verbose_name='Скетч читателей')),
+            ],
+            options={
+                'verbose_name': 'читатели публикации',
+                'verbose_name_plural': 'Читатели публикаций',
+            },
+        ),
+        migrations.AddField(
+            model_name='userstats',
+            name='readers',
+            field=models.BinaryField(default=b'', verbose_name='Скетч читателей'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_reader_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг обсуждения'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['trending_score'], name='post_trending_score_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_related_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostFingerprint',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('signature', models.BinaryField(verbose_name='Подпись MinHash')),
+                ('duplicate_of', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.post', verbose_name='Похожа на')),
+            ],
+            options={
+                'verbose_name': 'подпись публикации',
+                'verbose_name_plural': 'Подписи публикаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='FingerprintBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True, verbose_name='Корзина')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprint_buckets', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'корзина LSH',
+                'verbose_name_plural': 'Корзины LSH',
+            },
+        ),
+    ]
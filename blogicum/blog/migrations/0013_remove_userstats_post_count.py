@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_fingerprints'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userstats',
+            name='post_count',
+        ),
+    ]
@@ -0,0 +1,80 @@
+"""Подписи MinHash и ключи LSH для поиска почти одинаковых текстов.
+
+Текст разбивается на шинглы — последовательности из
+MINHASH_SHINGLE_WORDS слов. Подпись — минимумы хэшей шинглов по
+MINHASH_BANDS * MINHASH_ROWS независимым хэш-функциям вида
+(a·x + b) mod p; доля совпавших значений двух подписей оценивает
+коэффициент Жаккара их множеств шинглов. Подпись делится на
+MINHASH_BANDS полос, каждая полоса даёт ключ корзины: тексты
+со сходством s совпадают хотя бы в одной корзине с вероятностью
+1 − (1 − s**MINHASH_ROWS)**MINHASH_BANDS, а поиск кандидатов — это
+MINHASH_BANDS обращений к индексу, без попарного сравнения текстов.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+from .constants import MINHASH_BANDS, MINHASH_ROWS, MINHASH_SHINGLE_WORDS
+
+WORD_RE = re.compile(r'\w+')
+
+PRIME = (1 << 31) - 1
+SIZE = MINHASH_BANDS * MINHASH_ROWS
+
+# Коэффициенты хэш-функций постоянны: подписи, посчитанные разными
+# процессами и в разное время, должны быть сравнимы.
+_rng = np.random.default_rng(20231026)
+MULTIPLIERS = _rng.integers(1, PRIME, size=SIZE, dtype=np.uint64)
+INCREMENTS = _rng.integers(0, PRIME, size=SIZE, dtype=np.uint64)
+
+
+def get_shingles(text):
+    """Множество шинглов текста без учёта регистра и пунктуации."""
+    words = WORD_RE.findall(text.lower())
+    size = min(MINHASH_SHINGLE_WORDS, len(words))
+    return {
+        ' '.join(words[start:start + size])
+        for start in range(len(words) - size + 1)
+    } if words else set()
+
+
+def hash_shingle(shingle):
+    """Хэш шингла в диапазоне [0, PRIME)."""
+    digest = hashlib.blake2b(shingle.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % PRIME
+
+
+def get_signature(text):
+    """Подпись текста; None для текста без слов."""
+    shingles = get_shingles(text)
+    if not shingles:
+        return None
+    hashes = np.fromiter(
+        map(hash_shingle, shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # Произведение меньше 2**62 и помещается в uint64.
+    values = (np.outer(MULTIPLIERS, hashes) + INCREMENTS[:, None]) % PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def get_band_keys(signature):
+    """Ключи корзин LSH по полосам подписи."""
+    keys = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        digest = hashlib.blake2b(
+            bytes([band]) + rows.tobytes(), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def get_similarity(left, right):
+    """Оценка коэффициента Жаккара по двум подписям."""
+    return float(np.mean(left == right))
+
+
+def load_signature(value):
+    """Подпись из значения двоичного поля."""
+    return np.frombuffer(bytes(value), dtype=np.uint32)
@@ -1,8 +1,14 @@
 from django.contrib.auth.models import User
 from django.db import models
 from django.urls import reverse
+from django.utils.text import Truncator
 
-from .constants import TITLE_MAX_LENGTH
+from .constants import EXCERPT_WORDS, TITLE_MAX_LENGTH
+from .hll import estimate
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
 
 
 class PublishedCreatedFieldsAddModel(models.Model):
@@ -59,6 +65,11 @@ class Location (PublishedCreatedFieldsAddModel):
         return self.name[:TITLE_MAX_LENGTH]
 
 
+class PostManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Post(PublishedCreatedFieldsAddModel):
     title = models.CharField(
         'Заголовок',
@@ -66,8 +77,10 @@ class Post(PublishedCreatedFieldsAddModel):
     )
 
     text = models.TextField('Текст')
+    excerpt = models.TextField('Отрывок', blank=True, editable=False)
     pub_date = models.DateTimeField(
         'Дата и время публикации',
+        db_index=True,
         help_text=(
             'Если установить дату и время в будущем — '
             'можно делать отложенные публикации.'
@@ -76,6 +89,7 @@ class Post(PublishedCreatedFieldsAddModel):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         related_query_name="author",
         verbose_name='Автор публикации',
     )
@@ -97,16 +111,53 @@ class Post(PublishedCreatedFieldsAddModel):
         upload_to='post_images',
         blank=True,
     )
+    views = models.PositiveIntegerField(
+        'Просмотры', default=0, editable=False
+    )
+    trending_score = models.FloatField(
+        'Рейтинг обсуждения', null=True, blank=True, editable=False
+    )
+    deleted_at = models.DateTimeField(
+        'Удалено',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('is_published', 'pub_date'),
+                name='post_published_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', 'is_published', 'pub_date'),
+                name='post_author_published_idx',
+            ),
+            models.Index(
+                fields=('trending_score',),
+                name='post_trending_score_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:TITLE_MAX_LENGTH]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
@@ -118,7 +169,7 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name='comments',
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
 
     class Meta:
@@ -129,3 +180,161 @@ class Comment(models.Model):
             f'{self.post} ({self.author}) '
             f'{self.text[:TITLE_MAX_LENGTH]}'
         )
+
+
+class UserStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь',
+    )
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+    last_activity = models.DateTimeField(
+        'Последняя активность',
+        null=True,
+        blank=True,
+    )
+    readers = models.BinaryField('Скетч читателей', default=b'')
+
+    class Meta:
+        verbose_name = 'статистика пользователя'
+        verbose_name_plural = 'Статистика пользователей'
+
+    def __str__(self):
+        return str(self.user)
+
+    @property
+    def reader_count(self):
+        return estimate(self.readers)
+
+
+class DeletionTask(models.Model):
+    POST = 'post'
+    USER = 'user'
+    KIND_CHOICES = (
+        (POST, 'Публикация'),
+        (USER, 'Пользователь'),
+    )
+
+    kind = models.CharField('Объект', max_length=4, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField('Идентификатор объекта')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+    comments_deleted = models.PositiveIntegerField(
+        'Удалено комментариев', default=0
+    )
+    posts_deleted = models.PositiveIntegerField(
+        'Удалено публикаций', default=0
+    )
+
+    class Meta:
+        verbose_name = 'задача удаления'
+        verbose_name_plural = 'Задачи удаления'
+        ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('kind', 'object_id'),
+                name='deletion_task_object_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.object_id}'
+
+
+class PostReaders(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='reader_sketch',
+        verbose_name='Публикация',
+    )
+    sketch = models.BinaryField('Скетч читателей')
+
+    class Meta:
+        verbose_name = 'читатели публикации'
+        verbose_name_plural = 'Читатели публикаций'
+
+    def __str__(self):
+        return str(self.post_id)
+
+    @property
+    def reader_count(self):
+        return estimate(self.sketch)
+
+
+class RelatedPost(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='related_links',
+        verbose_name='Публикация',
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Похожая публикация',
+    )
+    score = models.FloatField('Близость')
+    rank = models.PositiveSmallIntegerField('Место')
+
+    class Meta:
+        verbose_name = 'похожая публикация'
+        verbose_name_plural = 'Похожие публикации'
+        ordering = ('post', 'rank')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'rank'), name='related_post_rank_unique'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} → {self.related_id}'
+
+
+class PostFingerprint(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='fingerprint',
+        verbose_name='Публикация',
+    )
+    signature = models.BinaryField('Подпись MinHash')
+    duplicate_of = models.ForeignKey(
+        Post,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Похожа на',
+    )
+
+    class Meta:
+        verbose_name = 'подпись публикации'
+        verbose_name_plural = 'Подписи публикаций'
+
+    def __str__(self):
+        return str(self.post_id)
+
+
+class FingerprintBucket(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='fingerprint_buckets',
+        verbose_name='Публикация',
+    )
+    key = models.BigIntegerField('Корзина', db_index=True)
+
+    class Meta:
+        verbose_name = 'корзина LSH'
+        verbose_name_plural = 'Корзины LSH'
+
+    def __str__(self):
+        return f'{self.key} → {self.post_id}'
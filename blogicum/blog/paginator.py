@@ -0,0 +1,89 @@
+"""Пагинаторы без полного подсчёта записей."""
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+from .constants import ESTIMATED_COUNT_THRESHOLD, FEED_COUNT_TIMEOUT
+from .feed_counts import get_count_key
+
+ESTIMATE_QUERIES = {
+    'postgresql': (
+        'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    ),
+    'mysql': (
+        'SELECT table_rows FROM information_schema.tables '
+        'WHERE table_schema = DATABASE() AND table_name = %s'
+    ),
+    # Таблица sqlite_stat1 появляется после выполнения ANALYZE.
+    'sqlite': 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+}
+
+
+def estimate_count(model, using='default'):
+    """Оценка числа строк таблицы по статистике базы данных.
+
+    Возвращает None, если статистика недоступна.
+    """
+    connection = connections[using]
+    query = ESTIMATE_QUERIES.get(connection.vendor)
+    if query is None:
+        return None
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(query, [model._meta.db_table])
+        except DatabaseError:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    if estimate < 0:
+        return None
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, оценивающий размер нефильтрованной выборки."""
+
+    @cached_property
+    def count(self):
+        """Оценка для больших таблиц и точный подсчёт для остальных.
+
+        Оценивается выборка без условий сверх менеджера по умолчанию,
+        например список админки без фильтров и поиска; в оценку
+        попадают и строки, скрытые менеджером.
+        """
+        queryset = self.object_list
+        default = queryset.model._default_manager.all()
+        if queryset.query.where == default.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if (
+                estimate is not None
+                and estimate >= ESTIMATED_COUNT_THRESHOLD
+            ):
+                return estimate
+        return super().count
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор ленты с размером из кэша вместо COUNT(*).
+
+    При промахе размер ленты считается заново и кэшируется. Оценка по
+    статистике не подходит: она считает все строки таблицы, включая
+    снятые с публикации, отложенные и удалённые публикации.
+    """
+
+    def __init__(self, object_list, per_page, feed, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+
+    @cached_property
+    def count(self):
+        """Размер ленты из кэша или подсчёта."""
+        key = get_count_key(self.feed)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.add(key, count, FEED_COUNT_TIMEOUT)
+        return max(count, 0)
@@ -0,0 +1,95 @@
+"""Ограничение частоты записи скользящим окном.
+
+Запросы считаются по окнам длиной в период бюджета. Счётчик текущего
+окна увеличивается атомарным incr кэша, поэтому одновременные запросы
+получают разные значения и пачка запросов не проходит сверх бюджета,
+как при чтении и записи счётчика отдельными операциями. Прошлое окно
+учитывается с весом оставшейся доли периода, так что на границе окон
+не проходит двойной бюджет.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.shortcuts import render
+
+from .constants import RATE_LIMIT_CACHE, RATE_LIMITS
+
+
+def get_rate_limit_cache():
+    """Кэш для корзин; при отсутствии алиаса используется кэш по умолчанию."""
+    try:
+        return caches[
+            getattr(settings, 'BLOG_RATE_LIMIT_CACHE', RATE_LIMIT_CACHE)
+        ]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def get_budget(scope):
+    """Бюджет записи для точки входа с учётом настроек проекта."""
+    budgets = {**RATE_LIMITS, **getattr(settings, 'BLOG_RATE_LIMITS', {})}
+    return budgets[scope]
+
+
+def take_token(key, capacity, period):
+    """Учёт запроса в бюджете.
+
+    Возвращает 0, если запрос разрешён, иначе число секунд
+    до повторной попытки.
+    """
+    cache = get_rate_limit_cache()
+    window, elapsed = divmod(time.time(), period)
+    current_key = f'{key}:{int(window)}'
+    cache.add(current_key, 0, 2 * period)
+    try:
+        count = cache.incr(current_key)
+    except ValueError:
+        # Ключ вытеснен из кэша между add и incr.
+        cache.set(current_key, 1, 2 * period)
+        count = 1
+    previous = cache.get(f'{key}:{int(window) - 1}', 0)
+    if previous * (1 - elapsed / period) + count <= capacity:
+        return 0
+    try:
+        # Отклонённый запрос не расходует бюджет.
+        cache.decr(current_key)
+    except ValueError:
+        pass
+    if count > capacity:
+        wait = period - elapsed
+    else:
+        wait = period * (1 - (capacity - count) / previous) - elapsed
+    return max(1, math.ceil(wait))
+
+
+def rate_limit(scope):
+    """Декоратор, ограничивающий POST-запросы пользователя к вью."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+            if request.user.is_authenticated:
+                client = f'user:{request.user.pk}'
+            else:
+                client = f'ip:{request.META.get("REMOTE_ADDR")}'
+            capacity, period = get_budget(scope)
+            retry_after = take_token(
+                f'ratelimit:{scope}:{client}', capacity, period
+            )
+            if not retry_after:
+                return view(request, *args, **kwargs)
+            response = render(
+                request,
+                'pages/429.html',
+                {'retry_after': retry_after},
+                status=429,
+            )
+            response['Retry-After'] = str(retry_after)
+            return response
+        return wrapper
+    return decorator
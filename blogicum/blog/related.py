@@ -0,0 +1,246 @@
+"""Похожие публикации по косинусной близости векторов TF-IDF.
+
+Модель строится офлайн командой `build_related_posts`. Первый проход
+по публикациям порциями считает документную частоту слов заголовка
+и текста, второй строит разреженную матрицу весов в формате CSR:
+массивы смещений строк, номеров слов и весов, без плотной матрицы
+документы × слова. Близость считается блоками строк через
+инвертированный индекс: попадания блока складываются `bincount`
+в плотный массив не больше RELATED_CHUNK_CELLS ячеек, а число
+попаданий в блоке ограничено RELATED_CHUNK_HITS. Для каждой
+публикации хранится RELATED_POSTS ближайших соседей в `RelatedPost`,
+поэтому страница публикации добавляет один запрос по индексу.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+
+from .constants import (
+    RELATED_CHUNK_CELLS, RELATED_CHUNK_HITS, RELATED_MAX_DF, RELATED_MIN_DF,
+    RELATED_MIN_SCORE, RELATED_POSTS,
+)
+from .models import Post, RelatedPost
+
+WORD_RE = re.compile(r'\w{3,}')
+
+
+def tokenize(title, text):
+    """Слова заголовка и текста в нижнем регистре."""
+    return WORD_RE.findall(f'{title} {text}'.lower())
+
+
+def iter_documents(posts, batch_size):
+    """Пары (id, слова) порциями по первичному ключу."""
+    posts = posts.order_by('pk').values_list('pk', 'title', 'text')
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:batch_size])
+        if not chunk:
+            return
+        for pk, title, text in chunk:
+            yield pk, tokenize(title, text)
+        last_pk = chunk[-1][0]
+
+
+class TfidfModel:
+    """Нормированные векторы TF-IDF публикаций в формате CSR."""
+
+    def __init__(self, posts, batch_size):
+        """Построение модели двумя проходами по публикациям."""
+        self.build_vocabulary(iter_documents(posts, batch_size))
+        self.build_matrix(iter_documents(posts, batch_size))
+        self.build_postings()
+
+    def build_vocabulary(self, documents):
+        """Словарь и веса IDF без редких и слишком частых слов."""
+        frequency = Counter()
+        total = 0
+        for _, words in documents:
+            frequency.update(set(words))
+            total += 1
+        max_df = max(RELATED_MIN_DF, RELATED_MAX_DF * total)
+        vocabulary = sorted(
+            word for word, df in frequency.items()
+            if RELATED_MIN_DF <= df <= max_df
+        )
+        self.columns = {word: column for column, word in enumerate(vocabulary)}
+        self.idf = np.array(
+            [
+                math.log((1 + total) / (1 + frequency[word])) + 1
+                for word in vocabulary
+            ],
+            dtype=np.float32,
+        )
+
+    def build_matrix(self, documents):
+        """Строки CSR с весом (1 + ln tf) · idf, нормированные по длине."""
+        ids, indptr, indices, data = [], [0], [], []
+        for pk, words in documents:
+            counts = Counter(
+                self.columns[word] for word in words if word in self.columns
+            )
+            columns = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            tf = np.fromiter(
+                counts.values(), dtype=np.float32, count=len(counts)
+            )
+            weights = (1 + np.log(tf)) * self.idf[columns]
+            norm = np.linalg.norm(weights)
+            if norm:
+                weights /= norm
+            ids.append(pk)
+            indptr.append(indptr[-1] + len(columns))
+            indices.append(columns)
+            data.append(weights)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = (
+            np.concatenate(indices) if indices else np.empty(0, np.int64)
+        )
+        self.data = np.concatenate(data) if data else np.empty(0, np.float32)
+        self.row_of_entry = np.repeat(
+            np.arange(len(self.ids)), np.diff(self.indptr)
+        )
+
+    def build_postings(self):
+        """Инвертированный индекс: строки и веса по словам."""
+        order = np.argsort(self.indices, kind='stable')
+        self.posting_rows = self.row_of_entry[order]
+        self.posting_data = self.data[order]
+        self.posting_ptr = np.zeros(len(self.idf) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.indices, minlength=len(self.idf)),
+            out=self.posting_ptr[1:],
+        )
+
+    def iter_blocks(self, rows):
+        """Блоки строк в пределах RELATED_CHUNK_CELLS и RELATED_CHUNK_HITS."""
+        hits = np.bincount(
+            self.row_of_entry,
+            weights=np.diff(self.posting_ptr)[self.indices],
+            minlength=len(self.ids),
+        )
+        max_rows = max(1, RELATED_CHUNK_CELLS // max(1, len(self.ids)))
+        block, block_hits = [], 0
+        for row in rows:
+            if block and (
+                len(block) >= max_rows
+                or block_hits + hits[row] > RELATED_CHUNK_HITS
+            ):
+                yield np.array(block)
+                block, block_hits = [], 0
+            block.append(row)
+            block_hits += hits[row]
+        if block:
+            yield np.array(block)
+
+    def similarities(self, block):
+        """Плотная матрица близости строк блока ко всем строкам."""
+        starts, ends = self.indptr[block], self.indptr[block + 1]
+        entries = np.concatenate(
+            [np.arange(start, end) for start, end in zip(starts, ends)]
+        )
+        local = np.repeat(np.arange(len(block)), ends - starts)
+        columns = self.indices[entries]
+        lengths = self.posting_ptr[columns + 1] - self.posting_ptr[columns]
+        # Позиции всех попаданий в инвертированном индексе без цикла
+        # по словам: начало списка слова плюс сдвиг внутри него.
+        offsets = np.repeat(
+            self.posting_ptr[columns] - np.cumsum(lengths) + lengths,
+            lengths,
+        ) + np.arange(lengths.sum())
+        keys = (
+            np.repeat(local, lengths) * len(self.ids)
+            + self.posting_rows[offsets]
+        )
+        weights = (
+            np.repeat(self.data[entries], lengths) * self.posting_data[offsets]
+        )
+        scores = np.bincount(
+            keys, weights=weights, minlength=len(block) * len(self.ids)
+        ).reshape(len(block), len(self.ids))
+        scores[np.arange(len(block)), block] = 0
+        return scores
+
+    def neighbors(self, rows):
+        """Соседи строк: id публикации → [(id соседа, близость)].
+
+        Матрица блока почти пуста, поэтому соседи выбираются среди
+        ячеек выше RELATED_MIN_SCORE, а не сортировкой целых строк.
+        """
+        result = {}
+        for block in self.iter_blocks(rows):
+            scores = self.similarities(block)
+            local, other = np.nonzero(scores >= RELATED_MIN_SCORE)
+            bounds = np.searchsorted(local, np.arange(len(block) + 1))
+            for position, row in enumerate(block):
+                candidates = other[bounds[position]:bounds[position + 1]]
+                values = scores[position, candidates]
+                best = np.argsort(-values, kind='stable')[:RELATED_POSTS]
+                result[int(self.ids[row])] = [
+                    (int(self.ids[column]), float(value))
+                    for column, value in zip(candidates[best], values[best])
+                ]
+        return result
+
+
+def save_neighbors(neighbors):
+    """Замена списков соседей у перечисленных публикаций."""
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=list(neighbors)).delete()
+        RelatedPost.objects.bulk_create(
+            RelatedPost(post_id=pk, related_id=related, score=score, rank=rank)
+            for pk, pairs in neighbors.items()
+            for rank, (related, score) in enumerate(pairs)
+        )
+
+
+def merge_reverse(neighbors):
+    """Списки старых публикаций, в которые входят новые.
+
+    Близость симметрична: новая публикация попадает в список своего
+    соседа, если она ближе последнего из его соседей.
+    """
+    candidates = {}
+    for pk, pairs in neighbors.items():
+        for related, score in pairs:
+            if related not in neighbors:
+                candidates.setdefault(related, {})[pk] = score
+    current = RelatedPost.objects.filter(
+        post_id__in=list(candidates)
+    ).values_list('post_id', 'related_id', 'score')
+    for pk, related, score in current:
+        candidates[pk].setdefault(related, score)
+    return {
+        pk: sorted(pairs.items(), key=lambda pair: -pair[1])[:RELATED_POSTS]
+        for pk, pairs in candidates.items()
+    }
+
+
+def build_related_posts(new_only=False, batch_size=2000):
+    """Расчёт соседей; число публикаций с обновлёнными списками.
+
+    С new_only соседи считаются только для публикаций без списка,
+    а сами эти публикации добавляются в списки своих соседей.
+    Правка текста старых публикаций учитывается полным пересчётом.
+    """
+    posts = Post.objects.filter(is_published=True)
+    model = TfidfModel(posts, batch_size)
+    rows = range(len(model.ids))
+    if new_only:
+        built = set(
+            RelatedPost.objects.values_list('post_id', flat=True).distinct()
+        )
+        rows = [row for row in rows if model.ids[row] not in built]
+    else:
+        RelatedPost.objects.exclude(post__in=posts).delete()
+    updated = 0
+    for start in range(0, len(rows), batch_size):
+        neighbors = model.neighbors(rows[start:start + batch_size])
+        if new_only:
+            neighbors.update(merge_reverse(neighbors))
+        save_neighbors(neighbors)
+        updated += len(neighbors)
+    return updated
@@ -0,0 +1,261 @@
+"""Заполнение базы синтетическими данными для замеров.
+
+Строки генерируются пакетами (при необходимости — в нескольких
+процессах), а в базу попадают через bulk_create в одной транзакции
+на модель. Авторы и популярность постов распределены по степенному
+закону, часть постов отложена, часть категорий снята с публикации.
+"""
+import itertools
+import random
+import uuid
+from datetime import timedelta
+from multiprocessing import Pool
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .feed_counts import invalidate_feed_counts
+from .models import Category, Comment, Location, Post, make_excerpt
+from .stats import refresh_user_stats
+from .trending import rescore_trending
+
+
+User = get_user_model()
+
+WORDS = (
+    'город', 'река', 'дорога', 'утро', 'вечер', 'поезд', 'море', 'лес',
+    'гора', 'друг', 'книга', 'кофе', 'дождь', 'солнце', 'ветер', 'небо',
+    'путь', 'дом', 'окно', 'музыка', 'история', 'встреча', 'зима', 'лето',
+    'осень', 'весна', 'письмо', 'мост', 'сад', 'песня', 'фото', 'чай',
+)
+
+# Показатель степенного закона для авторов и популярности постов.
+ZIPF_EXPONENT = 1.1
+# Глубина ленты в минутах: посты распределены по последним ~2 годам.
+PUB_DATE_SPREAD = 60 * 24 * 730
+
+_worker_state = {}
+
+
+def make_text(rng, words):
+    """Случайный текст из заданного числа слов."""
+    return ' '.join(rng.choices(WORDS, k=words))
+
+
+def zipf_cum_weights(size):
+    """Накопленные веса степенного распределения по рангам."""
+    return list(itertools.accumulate(
+        1 / rank ** ZIPF_EXPONENT for rank in range(1, size + 1)
+    ))
+
+
+def init_worker(state):
+    """Подготовка воркера: идентификаторы и веса для выборки."""
+    _worker_state.clear()
+    _worker_state.update(state)
+    _worker_state['author_weights'] = zipf_cum_weights(
+        len(state['user_ids'])
+    )
+    if state.get('post_ids'):
+        _worker_state['post_weights'] = zipf_cum_weights(
+            len(state['post_ids'])
+        )
+
+
+def build_posts(task):
+    """Строки постов одного пакета."""
+    batch_seed, size = task
+    state = _worker_state
+    rng = random.Random(batch_seed)
+    now = state['now']
+    authors = rng.choices(
+        state['user_ids'], cum_weights=state['author_weights'], k=size
+    )
+    rows = []
+    for author_id in authors:
+        if rng.random() < state['scheduled_share']:
+            pub_date = now + timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+        else:
+            pub_date = now - timedelta(
+                minutes=rng.randint(1, PUB_DATE_SPREAD)
+            )
+        rows.append((
+            make_text(rng, rng.randint(2, 6)),
+            make_text(rng, int(rng.lognormvariate(4, 0.8)) + 5),
+            pub_date,
+            author_id,
+            rng.choice(state['category_ids']),
+            rng.choice(state['location_ids']) if rng.random() < 0.7 else None,
+            rng.random() >= state['hidden_share'],
+        ))
+    return rows
+
+
+def build_comments(task):
+    """Строки комментариев одного пакета."""
+    batch_seed, size = task
+    state = _worker_state
+    rng = random.Random(batch_seed)
+    posts = rng.choices(
+        state['post_ids'], cum_weights=state['post_weights'], k=size
+    )
+    authors = rng.choices(
+        state['user_ids'], cum_weights=state['author_weights'], k=size
+    )
+    return [
+        (make_text(rng, rng.randint(3, 40)), post_id, author_id)
+        for post_id, author_id in zip(posts, authors)
+    ]
+
+
+def get_max_pk(model):
+    """Наибольший первичный ключ таблицы или 0."""
+    return model.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0
+
+
+def get_new_ids(model, after_pk):
+    """Идентификаторы строк, созданных после after_pk."""
+    return list(
+        model.objects.filter(pk__gt=after_pk).values_list('pk', flat=True)
+    )
+
+
+def insert_batches(model, builder, make_object, total, state, options):
+    """Генерация пакетов строк и их вставка через bulk_create."""
+    batch_size = options['batch_size']
+    rng = random.Random(options['seed'])
+    tasks = [
+        (rng.getrandbits(64), min(batch_size, total - start))
+        for start in range(0, total, batch_size)
+    ]
+    progress = options['progress']
+    workers = options['workers']
+    done = 0
+    with transaction.atomic():
+        if workers > 1:
+            with Pool(workers, init_worker, (state,)) as pool:
+                for rows in pool.imap(builder, tasks):
+                    model.objects.bulk_create(
+                        map(make_object, rows), batch_size=batch_size
+                    )
+                    done += len(rows)
+                    progress(model, done, total)
+        else:
+            init_worker(state)
+            for rows in map(builder, tasks):
+                model.objects.bulk_create(
+                    map(make_object, rows), batch_size=batch_size
+                )
+                done += len(rows)
+                progress(model, done, total)
+
+
+def make_post(row):
+    """Объект поста из сгенерированной строки."""
+    title, text, pub_date, author_id, category_id, location_id, shown = row
+    return Post(
+        title=title,
+        text=text,
+        excerpt=make_excerpt(text),
+        pub_date=pub_date,
+        author_id=author_id,
+        category_id=category_id,
+        location_id=location_id,
+        is_published=shown,
+    )
+
+
+def make_comment(row):
+    """Объект комментария из сгенерированной строки."""
+    text, post_id, author_id = row
+    return Comment(text=text, post_id=post_id, author_id=author_id)
+
+
+def seed_dataset(
+    users=10,
+    categories=5,
+    locations=5,
+    posts=100,
+    comments=300,
+    batch_size=5000,
+    workers=1,
+    seed=None,
+    scheduled_share=0.02,
+    hidden_share=0.02,
+    unpublished_category_share=0.1,
+    progress=None,
+):
+    """Создание пользователей, категорий, мест, постов и комментариев."""
+    rng = random.Random(seed)
+    prefix = f'seed{uuid.uuid4().hex[:8]}'
+    options = {
+        'batch_size': batch_size,
+        'workers': workers,
+        'seed': rng.getrandbits(64),
+        'progress': progress or (lambda model, done, total: None),
+    }
+    password = make_password(None)
+
+    with transaction.atomic():
+        after_pk = get_max_pk(User)
+        User.objects.bulk_create(
+            (
+                User(username=f'{prefix}_{index}', password=password)
+                for index in range(users)
+            ),
+            batch_size=batch_size,
+        )
+        user_ids = get_new_ids(User, after_pk)
+        rng.shuffle(user_ids)
+
+        after_pk = get_max_pk(Category)
+        Category.objects.bulk_create(
+            (
+                Category(
+                    title=make_text(rng, 2),
+                    description=make_text(rng, 10),
+                    slug=f'{prefix}-{index}',
+                    is_published=rng.random() >= unpublished_category_share,
+                )
+                for index in range(categories)
+            ),
+            batch_size=batch_size,
+        )
+        category_ids = get_new_ids(Category, after_pk)
+
+        after_pk = get_max_pk(Location)
+        Location.objects.bulk_create(
+            (
+                Location(name=f'{prefix} {index}', is_published=index > 0)
+                for index in range(locations)
+            ),
+            batch_size=batch_size,
+        )
+        location_ids = get_new_ids(Location, after_pk)
+
+    state = {
+        'now': timezone.now(),
+        'user_ids': user_ids,
+        'category_ids': category_ids,
+        'location_ids': location_ids,
+        'scheduled_share': scheduled_share,
+        'hidden_share': hidden_share,
+    }
+    after_pk = get_max_pk(Post)
+    insert_batches(Post, build_posts, make_post, posts, state, options)
+    post_ids = get_new_ids(Post, after_pk) if comments else []
+    if post_ids:
+        # Горячие посты разбросаны по ленте, а не собраны в её начале.
+        rng.shuffle(post_ids)
+        state['post_ids'] = post_ids
+        insert_batches(
+            Comment, build_comments, make_comment, comments, state, options
+        )
+    # bulk_create не отправляет сигналы, счётчики считаются разом.
+    refresh_user_stats(user_ids)
+    rescore_trending()
+    invalidate_feed_counts()
+    return prefix
@@ -0,0 +1,117 @@
+"""Обработчики сигналов: статистика, рейтинг, подписи, кэши и ленты."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import category_cache
+from .duplicates import fingerprint_post
+from .feed_counts import (
+    change_feed_counts, get_feed_fields, get_post_feeds,
+    invalidate_feed_counts,
+)
+from .models import Category, Comment, Post, UserStats
+from .stats import change_stats, invalidate_profile_header
+from .trending import add_comment_score
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+def count_created_post(sender, instance, created, raw, **kwargs):
+    """Учёт новой публикации в активности автора."""
+    if created and not raw:
+        change_stats(instance.author_id, activity=instance.created_at)
+
+
+@receiver(post_save, sender=Post)
+def fingerprint_saved_post(sender, instance, created, raw, update_fields,
+                           **kwargs):
+    """Подпись нового или изменённого текста и отметка о копии."""
+    if not raw and (
+        created or update_fields is None or 'text' in update_fields
+    ):
+        fingerprint_post(instance, created=created)
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, raw, **kwargs):
+    """Учёт нового комментария автора."""
+    if created and not raw:
+        change_stats(
+            instance.author_id,
+            activity=instance.created_at,
+            comment_count=1,
+        )
+
+
+@receiver(post_save, sender=Comment)
+def score_created_comment(sender, instance, created, raw, **kwargs):
+    """Прибавление нового комментария к рейтингу обсуждения."""
+    if created and not raw:
+        add_comment_score(instance.post_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """Учёт удалённого комментария автора."""
+    change_stats(instance.author_id, comment_count=-1)
+
+
+@receiver(post_save, sender=User)
+def refresh_profile_header(sender, instance, created, raw, **kwargs):
+    """Заведение статистики нового пользователя или сброс шапки профиля."""
+    if created and not raw:
+        UserStats.objects.create(user=instance)
+    else:
+        invalidate_profile_header(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_category_cache(sender, **kwargs):
+    """Смена версии кэша категорий и сброс размеров лент.
+
+    Повтор после фиксации не даёт другому процессу закрепить
+    прочитанные до неё данные под новой версией.
+    """
+    category_cache.bump_version()
+    transaction.on_commit(category_cache.bump_version)
+    invalidate_feed_counts()
+
+
+@receiver(post_init, sender=Post)
+def remember_feed_fields(sender, instance, **kwargs):
+    """Запоминание полей, по которым публикация попадает в ленты."""
+    instance._feed_fields = (
+        get_feed_fields(instance) if instance.pk is not None else ()
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_feed_counts(sender, instance, created, raw, **kwargs):
+    """Изменение размеров лент, куда публикация попала или откуда ушла."""
+    if raw:
+        invalidate_feed_counts()
+        return
+    old_fields = () if created else instance._feed_fields
+    new_fields = get_feed_fields(instance)
+    if old_fields is None or new_fields is None:
+        invalidate_feed_counts()
+    else:
+        old_feeds = get_post_feeds(old_fields) if old_fields else set()
+        new_feeds = get_post_feeds(new_fields)
+        change_feed_counts(old_feeds - new_feeds, -1)
+        change_feed_counts(new_feeds - old_feeds, 1)
+    instance._feed_fields = new_fields
+
+
+@receiver(post_delete, sender=Post)
+def discount_deleted_post(sender, instance, **kwargs):
+    """Уменьшение размеров лент удалённой публикации."""
+    feed_fields = get_feed_fields(instance)
+    if feed_fields is None:
+        invalidate_feed_counts()
+    else:
+        change_feed_counts(get_post_feeds(feed_fields), -1)
@@ -0,0 +1,102 @@
+"""Счётчики активности пользователей для шапки профиля.
+
+Число комментариев в `UserStats` меняется на разницу при их создании
+и удалении, а последняя активность — при новых публикациях и
+комментариях, поэтому страница профиля не считает агрегаты по всей
+истории пользователя. Комментарии к публикации с отметкой `deleted_at`
+уже не учитываются. Число публикаций шапка берёт у пагинатора ленты
+профиля: оно зависит от того, видит ли посетитель черновики. После массовых
+вставок в обход сигналов счётчики пересчитываются `refresh_user_stats`.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.db.models import Count, F, Max, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Post, UserStats
+
+
+User = get_user_model()
+
+PROFILE_HEADER_FRAGMENT = 'profile_header'
+
+
+def get_header_cache_key(user_id):
+    """Ключ закэшированного фрагмента шапки профиля."""
+    return make_template_fragment_key(PROFILE_HEADER_FRAGMENT, [user_id])
+
+
+def invalidate_profile_header(*user_ids):
+    """Сброс закэшированной шапки профиля пользователей."""
+    cache.delete_many([get_header_cache_key(pk) for pk in user_ids])
+
+
+def get_user_stats(user):
+    """Статистика пользователя, загруженная вместе с ним, или нули."""
+    return getattr(user, 'stats', None) or UserStats(user=user)
+
+
+def change_stats(user_id, activity=None, **deltas):
+    """Изменение счётчиков пользователя на заданные величины.
+
+    Если записи статистики ещё нет, она рассчитывается целиком при
+    росте счётчиков; при удалении уменьшать нечего.
+    """
+    updates = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+    }
+    if activity is not None:
+        updates['last_activity'] = Greatest(
+            Coalesce('last_activity', Value(activity)), Value(activity)
+        )
+    if UserStats.objects.filter(user_id=user_id).update(**updates):
+        invalidate_profile_header(user_id)
+    elif activity is not None:
+        refresh_user_stats([user_id])
+
+
+def refresh_user_stats(user_ids=None):
+    """Пересчёт статистики пользователей по их публикациям и комментариям.
+
+    Без user_ids пересчитываются все пользователи.
+    """
+    users = User.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    totals = {}
+    # Публикации учитываются только в последней активности, а
+    # комментарии к удалённым публикациям скрыты вместе с ними.
+    for objects, field in (
+        (Post.objects.all(), None),
+        (
+            Comment.objects.filter(post__deleted_at__isnull=True),
+            'comment_count',
+        ),
+    ):
+        rows = objects.filter(author__in=users).values(
+            'author'
+        ).annotate(total=Count('pk'), last=Max('created_at'))
+        for row in rows.order_by():
+            stats = totals.setdefault(
+                row['author'], UserStats(user_id=row['author'])
+            )
+            if field is not None:
+                setattr(stats, field, row['total'])
+            stats.last_activity = max(
+                filter(None, (stats.last_activity, row['last']))
+            )
+    user_ids = list(users.values_list('pk', flat=True))
+    with transaction.atomic():
+        # Скетч читателей не пересчитать по таблицам, он переносится.
+        readers = dict(UserStats.objects.filter(
+            user__in=users
+        ).values_list('user_id', 'readers'))
+        rows = [totals.get(pk) or UserStats(user_id=pk) for pk in user_ids]
+        for stats in rows:
+            stats.readers = readers.get(stats.user_id, b'')
+        UserStats.objects.filter(user__in=users).delete()
+        UserStats.objects.bulk_create(rows)
+    invalidate_profile_header(*user_ids)
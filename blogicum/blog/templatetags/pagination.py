@@ -0,0 +1,27 @@
+"""Теги постраничной навигации лент."""
+from django import template
+
+from blog.constants import PAGINATOR_ON_EACH_SIDE, PAGINATOR_ON_ENDS
+
+register = template.Library()
+
+
+@register.simple_tag
+def elided_page_range(page_obj):
+    """Номера страниц вокруг текущей и по краям, с пропусками между ними.
+
+    Число ссылок не зависит от длины ленты.
+    """
+    return page_obj.paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=PAGINATOR_ON_EACH_SIDE,
+        on_ends=PAGINATOR_ON_ENDS,
+    )
+
+
+@register.simple_tag(takes_context=True)
+def page_url(context, number):
+    """Адрес страницы ленты с остальными параметрами запроса."""
+    query = context['request'].GET.copy()
+    query['page'] = number
+    return f'?{query.urlencode()}'
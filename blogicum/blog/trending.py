@@ -0,0 +1,83 @@
+"""Рейтинг обсуждаемых публикаций с экспоненциальным затуханием.
+
+Вклад комментария убывает вдвое за TRENDING_HALF_LIFE секунд. Чтобы
+не переписывать рейтинги всех публикаций с течением времени, хранится
+логарифм суммы exp(λ·(t − TRENDING_EPOCH)) по комментариям: множитель
+затухания общий для всех публикаций и на порядок не влияет, а новый
+комментарий прибавляется к сумме одним UPDATE. Текущий рейтинг
+публикации — exp(score − λ·(now − TRENDING_EPOCH)).
+
+Удаление комментариев рейтинг не уменьшает; `rescore_trending`
+по расписанию пересчитывает рейтинги по комментариям за
+TRENDING_WINDOW и сбрасывает угасшие, чтобы индекс оставался малым.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from .constants import TRENDING_HALF_LIFE, TRENDING_MIN_SCORE, TRENDING_WINDOW
+from .models import Comment, Post
+
+TRENDING_EPOCH = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+
+DECAY_RATE = math.log(2) / TRENDING_HALF_LIFE
+
+
+def get_weight(moment):
+    """Логарифм вклада события в момент moment."""
+    return DECAY_RATE * (moment - TRENDING_EPOCH).total_seconds()
+
+
+def log_add(left, right):
+    """Логарифм суммы экспонент без переполнения."""
+    if left is None:
+        return right
+    return max(left, right) + math.log1p(math.exp(-abs(left - right)))
+
+
+def get_min_score(now=None):
+    """Наименьший хранимый рейтинг, который сейчас попадает в ленту."""
+    return get_weight(now or timezone.now()) + math.log(TRENDING_MIN_SCORE)
+
+
+def add_comment_score(post_id, created_at):
+    """Прибавление комментария к рейтингу публикации."""
+    weight = Value(get_weight(created_at), output_field=FloatField())
+    score = F('trending_score')
+    Post.all_objects.filter(pk=post_id).update(trending_score=Case(
+        When(trending_score__isnull=True, then=weight),
+        default=Greatest(score, weight) + Ln(
+            Value(1.0, output_field=FloatField()) + Exp(-Abs(score - weight))
+        ),
+        output_field=FloatField(),
+    ))
+
+
+def rescore_trending(now=None):
+    """Пересчёт рейтингов по комментариям окна; число публикаций в ленте."""
+    now = now or timezone.now()
+    scores = {}
+    comments = Comment.objects.filter(
+        created_at__gte=now - timedelta(seconds=TRENDING_WINDOW)
+    ).values_list('post_id', 'created_at')
+    for post_id, created_at in comments.iterator():
+        scores[post_id] = log_add(scores.get(post_id), get_weight(created_at))
+    min_score = get_min_score(now)
+    scores = {
+        pk: score for pk, score in scores.items() if score >= min_score
+    }
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        Post.all_objects.filter(
+            trending_score__isnull=False
+        ).update(trending_score=None)
+        cursor.executemany(
+            f'UPDATE {quote(Post._meta.db_table)} '
+            f'SET {quote("trending_score")} = %s WHERE {quote("id")} = %s',
+            [(score, pk) for pk, score in sorted(scores.items())],
+        )
+    return len(scores)
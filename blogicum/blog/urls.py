@@ -1,56 +1,66 @@
 """Импортирование функции для проверки адресов."""
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'blog'
 
-urlpatterns = [
-    path('', views.index, name='index'),
-    path(
-        'category/<slug:category_slug>/',
-        views.category_posts,
-        name='category_posts'
-    ),
-    path(
-        'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
-        name='post_detail'
-    ),
-    path(
-        'posts/<int:post_id>/edit/',
-        views.PostUpdateView.as_view(),
-        name='edit_post'
-    ),
-    path(
-        'posts/<int:post_id>/delete/',
-        views.PostDeleteView.as_view(),
-        name='delete_post'
-    ),
-    path(
-        'posts/create/',
-        views.post_create,
-        name='create_post'
-    ),
-    path(
-        'edit_profile/',
-        views.ProfileUpdateView.as_view(),
-        name='edit_profile'
-    ),
-    path('profile/<str:username>/', views.profile, name='profile'),
-    path(
-        'posts/<int:post_id>/comment/',
-        views.add_comment,
-        name='add_comment'
-    ),
-    path(
-        'posts/<int:post_id>/edit_comment/<int:comment_id>/',
-        views.CommentUpdateView.as_view(),
-        name='edit_comment'
-    ),
-    path(
-        'posts/<int:post_id>/delete_comment/<int:comment_id>/',
-        views.CommentDeleteView.as_view(),
-        name='delete_comment'
-    ),
-]
+
+def get_urlpatterns(feed_views):
+    """Адреса блога с лентами и страницей публикации из feed_views."""
+    return [
+        path('', feed_views.index, name='index'),
+        path('trending/', feed_views.trending, name='trending'),
+        path(
+            'category/<slug:category_slug>/',
+            feed_views.category_posts,
+            name='category_posts'
+        ),
+        path(
+            'posts/<int:post_id>/',
+            feed_views.PostDetailView.as_view(),
+            name='post_detail'
+        ),
+        path(
+            'posts/<int:post_id>/edit/',
+            views.PostUpdateView.as_view(),
+            name='edit_post'
+        ),
+        path(
+            'posts/<int:post_id>/delete/',
+            views.PostDeleteView.as_view(),
+            name='delete_post'
+        ),
+        path(
+            'posts/create/',
+            views.post_create,
+            name='create_post'
+        ),
+        path(
+            'edit_profile/',
+            views.ProfileUpdateView.as_view(),
+            name='edit_profile'
+        ),
+        path('profile/<str:username>/', feed_views.profile, name='profile'),
+        path(
+            'posts/<int:post_id>/comment/',
+            views.add_comment,
+            name='add_comment'
+        ),
+        path(
+            'posts/<int:post_id>/edit_comment/<int:comment_id>/',
+            views.CommentUpdateView.as_view(),
+            name='edit_comment'
+        ),
+        path(
+            'posts/<int:post_id>/delete_comment/<int:comment_id>/',
+            views.CommentDeleteView.as_view(),
+            name='delete_comment'
+        ),
+    ]
+
+
+urlpatterns = get_urlpatterns(
+    async_views if settings.BLOG_ASYNC_VIEWS else views
+)
@@ -1,48 +1,157 @@
 """Импорт функций, форм и моделей."""
-from django.http import HttpResponseRedirect
-from django.db.models import Count
+from http import HTTPStatus
+
+from django.http import Http404
+from django.db.models import (
+    Case, Count, F, OuterRef, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import (
     DeleteView, DetailView, UpdateView
 )
 from django.utils import timezone
-from django.urls import reverse_lazy, reverse
+from django.utils.functional import cached_property
+from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.contrib.auth import get_user_model
 
-from .constants import POSTS_ON_PAGE
+from .category_cache import get_published_category
+from .constants import (
+    DEFAULT_LOCATION_LABEL, POSTS_ON_PAGE, PROFILE_HEADER_CACHE_TIMEOUT
+)
+from .deletion import (
+    get_visible_comments, get_visible_users, soft_delete_post,
+)
+from .feed_counts import (
+    INDEX_FEED, TRENDING_FEED, get_author_feed, get_category_feed
+)
 from .forms import PostForm, CommentForm, UserForm
-from .models import Post, Category, Comment
+from .fragments import (
+    get_fragment_format, render_comment, render_deleted, render_form_errors
+)
+from .models import Post, Comment, RelatedPost
+from .paginator import CachedCountPaginator
+from .ratelimit import rate_limit
+from .stats import get_user_stats
+from .trending import get_min_score
+from .view_counts import get_reader, record_view
 
 
 User = get_user_model()
 
 
-def get_comment_object(**kwargs):
-    """Получение объекта комментария."""
-    return get_object_or_404(
-        Comment,
-        pk=kwargs['comment_id'],
-        post=kwargs['post_id'],
-        post__is_published=True,
-    )
-
-
 def get_post_object(author=None):
     """Получение объекта поста."""
-    post = Post.objects.annotate(
-        comment_count=Count('comments')
-    ).filter(
+    post = annotate_card_fields(Post.objects.filter(
         pub_date__lte=timezone.now(),
-        is_published=True, category__is_published=True,
-    ).order_by('-pub_date')
+        # Сравнение с True вместо условия по самому столбцу даёт
+        # SQLite взять диапазон индекса по нескольким полям.
+        is_published=Value(True),
+        category__is_published=True,
+    )).defer('text').order_by('-pub_date')
     if author:
-        post.filter(author=author)
+        post = post.filter(author=author)
     return post
 
 
+def get_comment_count():
+    """Число комментариев публикации коррелированным подзапросом.
+
+    В отличие от Count с GROUP BY подзапрос не мешает базе читать
+    публикации страницы из индекса сразу в порядке pub_date.
+    """
+    return Coalesce(Subquery(
+        get_visible_comments().filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+    ), 0)
+
+
+def annotate_card_fields(posts):
+    """Поля карточки публикации в том же запросе, что и сама публикация.
+
+    Шаблоны карточки и страницы публикации читают эти поля вместо
+    связанных объектов автора, категории и местоположения.
+    """
+    return posts.annotate(
+        author_username=F('author__username'),
+        category_slug=F('category__slug'),
+        category_title=F('category__title'),
+        category_is_published=F('category__is_published'),
+        location_label=Case(
+            When(location__is_published=True, then=F('location__name')),
+            default=Value(DEFAULT_LOCATION_LABEL),
+        ),
+        comment_count=get_comment_count(),
+    )
+
+
+def get_author_posts(author, show_hidden=False):
+    """Лента профиля по индексу (author, is_published, pub_date).
+
+    Скрытые и отложенные публикации видит только сам автор.
+    """
+    posts = Post.objects.filter(author=author)
+    if not show_hidden:
+        posts = posts.filter(
+            is_published=Value(True),
+            pub_date__lte=timezone.now(),
+            category__is_published=True,
+        )
+    return annotate_card_fields(posts).defer('text').order_by('-pub_date')
+
+
+def get_trending_posts():
+    """Обсуждаемые публикации по убыванию рейтинга."""
+    posts = Post.objects.filter(
+        pub_date__lte=timezone.now(),
+        # Условие по самому столбцу, а не сравнение с True, оставляет
+        # SQLite индекс рейтинга: он отдаёт строки уже по порядку.
+        is_published=True,
+        category__is_published=True,
+        trending_score__gte=get_min_score(),
+    )
+    return annotate_card_fields(posts).defer('text').order_by(
+        '-trending_score'
+    )
+
+
+def get_related_posts(post_id):
+    """Видимые похожие публикации одним запросом по индексу."""
+    return RelatedPost.objects.filter(
+        post_id=post_id,
+        related__is_published=True,
+        related__deleted_at__isnull=True,
+        related__pub_date__lte=timezone.now(),
+        related__category__is_published=True,
+    ).select_related('related').only(
+        'rank', 'related', 'related__title'
+    ).order_by('rank')
+
+
+def get_visible_post(user, post_id):
+    """Публикация для её страницы вместе с полями карточки или 404.
+
+    Снятую с публикации, отложенную или из снятой категории публикацию
+    видит только автор.
+    """
+    post = get_object_or_404(
+        annotate_card_fields(Post.objects.select_related('reader_sketch')),
+        pk=post_id,
+    )
+    if user.pk == post.author_id or (
+        post.is_published
+        and post.category_is_published
+        and post.pub_date <= timezone.now()
+    ):
+        return post
+    raise Http404('Публикация не найдена.')
+
+
 def get_user_object(self):
     """Проверка пользователя."""
     return get_object_or_404(
@@ -54,7 +163,9 @@ def get_user_object(self):
 def index(request):
     """Вью функция главной страницы."""
     posts_queryset = get_post_object()
-    paginator = Paginator(posts_queryset, POSTS_ON_PAGE)
+    paginator = CachedCountPaginator(
+        posts_queryset, POSTS_ON_PAGE, INDEX_FEED
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
@@ -64,18 +175,29 @@ def index(request):
     return render(request, template, context)
 
 
+def trending(request):
+    """Вью функция ленты обсуждаемых публикаций."""
+    paginator = CachedCountPaginator(
+        get_trending_posts(), POSTS_ON_PAGE, TRENDING_FEED
+    )
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'page_obj': page_obj
+    }
+    template = 'blog/trending.html'
+    return render(request, template, context)
+
+
 def category_posts(request, category_slug):
     """Вью функция для странциы категории."""
     template = 'blog/category.html'
-    category = get_object_or_404(
-        Category.objects,
-        slug=category_slug,
-        is_published=True,
-    )
+    category = get_published_category(category_slug)
     posts_queryset = get_post_object().filter(
-        category=category
+        category_id=category.pk
+    )
+    paginator = CachedCountPaginator(
+        posts_queryset, POSTS_ON_PAGE, get_category_feed(category.pk)
     )
-    paginator = Paginator(posts_queryset, POSTS_ON_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
@@ -93,28 +215,31 @@ class PostDetailView(DetailView):
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get(self, request, *args, **kwargs):
+        """Страница поста и учёт просмотра в буфере."""
+        response = super().get(request, *args, **kwargs)
+        record_view(self.object.pk, get_reader(request))
+        return response
+
     def get_context_data(self, **kwargs):
         """Получение данных для страницы."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = get_visible_comments().filter(
+            post=self.object
+        ).select_related('author')
+        context['related_posts'] = get_related_posts(self.object.pk)
         return context
 
     def get_object(self):
         """Получение объекта для вью класса."""
-        post_author = super().get_object()
-        if self.request.user == post_author.author:
-            return post_author
-        return get_object_or_404(
-            Post,
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now(),
-            id=self.kwargs['post_id'],
+        return get_visible_post(
+            self.request.user, self.kwargs[self.pk_url_kwarg]
         )
 
 
 @login_required
+@rate_limit('create_post')
 def post_create(request):
     """Вью функция для формы создания поста."""
     template_name = 'blog/create.html'
@@ -131,59 +256,82 @@ def post_create(request):
     return render(request, template_name, context)
 
 
-class PostUpdateView(UpdateView):
-    """Вью класс для формы редактирования поста."""
+class ObjectPermissionMixin:
+    """Объект страницы и проверка прав — один раз за запрос.
+
+    UpdateView и DeleteView обращаются к get_object() в get(), post(),
+    delete() и при построении адреса перехода; все эти обращения
+    получают объект, загруженный при проверке прав в dispatch().
+    Выборку, в которой ищется объект, задаёт get_queryset().
+    """
+
+    def has_object_permission(self, obj):
+        """Может ли пользователь менять объект."""
+        return True
+
+    def handle_no_object_permission(self):
+        """Ответ пользователю без прав на объект."""
+        raise Http404
+
+    @cached_property
+    def target_object(self):
+        """Объект страницы, загруженный при первом обращении."""
+        return super().get_object()
+
+    def get_object(self, queryset=None):
+        """Получение объекта страницы."""
+        if queryset is not None:
+            return super().get_object(queryset)
+        return self.target_object
+
+    def dispatch(self, request, *args, **kwargs):
+        """Проверка прав перед обработкой запроса."""
+        if not self.has_object_permission(self.get_object()):
+            return self.handle_no_object_permission()
+        return super().dispatch(request, *args, **kwargs)
+
+
+class PostAuthorMixin(ObjectPermissionMixin):
+    """Публикация, которую может менять только её автор."""
 
     model = Post
-    form_class = PostForm
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        """Функция проверки формы."""
-        if self.get_object().author != self.request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        get_post_object().filter(author=self.request.user)
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        """Опубликованные посты."""
+        return Post.objects.filter(is_published=True)
+
+    def has_object_permission(self, post):
+        """Права есть только у автора."""
+        return post.author_id == self.request.user.pk
+
+    def handle_no_object_permission(self):
+        """Переход на страницу поста."""
+        return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
-    def get_object(self):
-        """Получение объекта поста для страницы."""
-        return get_object_or_404(
-            Post, pk=self.kwargs['post_id'], is_published=True,
-        )
+
+class PostUpdateView(PostAuthorMixin, UpdateView):
+    """Вью класс для формы редактирования поста."""
+
+    form_class = PostForm
 
     def get_success_url(self):
         """Функция получения адреса."""
         return reverse_lazy(
             'blog:post_detail',
-            kwargs={'post_id': self.get_object().pk},
+            kwargs={'post_id': self.object.pk},
         )
 
 
-class PostDeleteView(DeleteView):
+class PostDeleteView(PostAuthorMixin, DeleteView):
     """Вью класс для формы удаления поста."""
 
-    model = Post
-    pk_url_kwarg = 'post_id'
-    template_name = 'blog/create.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        """Функция проверки формы."""
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-
-        get_object_or_404(
-            Post,
-            pk=kwargs['post_id'],
-            author=self.request.user,
-        )
-        return super().dispatch(request, *args, **kwargs)
-
-    def get_object(self):
-        """Получение объекта поста для страницы."""
-        return get_object_or_404(
-            Post, pk=self.kwargs['post_id'], is_published=True,
-        )
+    def delete(self, request, *args, **kwargs):
+        """Скрытие поста; комментарии удалит reap_deleted."""
+        self.object = self.get_object()
+        soft_delete_post(self.object)
+        return redirect(self.get_success_url())
 
     def get_success_url(self):
         """Функция получения адреса."""
@@ -194,40 +342,47 @@ class PostDeleteView(DeleteView):
 
 
 @login_required
+@rate_limit('add_comment')
 def add_comment(request, post_id):
     """Вью функция для формы создания комментария."""
     post = get_object_or_404(Post, pk=post_id, is_published=True,)
     form = CommentForm(request.POST)
+    fragment = get_fragment_format(request)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
         comment.save()
+        if fragment:
+            return render_comment(
+                request, comment, fragment, status=HTTPStatus.CREATED
+            )
+    elif fragment:
+        return render_form_errors(form, fragment)
     return redirect('blog:post_detail', post_id)
 
 
 def profile(request, username):
     """Вью функция для страницы пользователя."""
-    author = get_object_or_404(User, username=username)
-    if author == request.user:
-        posts_queryset = Post.objects.filter(
-            author=author
-        ).order_by('-pub_date').annotate(
-            comment_count=Count('comments')
-        )
-    else:
-        posts_queryset = get_post_object(author)
-    paginator = Paginator(posts_queryset, POSTS_ON_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    profile = get_object_or_404(
-        User,
+    author = get_object_or_404(
+        get_visible_users().select_related('stats'),
         username=username,
     )
+    show_hidden = author == request.user
+    posts_queryset = get_author_posts(author, show_hidden=show_hidden)
+    paginator = CachedCountPaginator(
+        posts_queryset,
+        POSTS_ON_PAGE,
+        get_author_feed(author.pk, show_hidden=show_hidden),
+    )
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
     template_name = 'blog/profile.html'
     context = {
         'page_obj': page_obj,
-        'profile': profile,
+        'profile': author,
+        'stats': get_user_stats(author),
+        'header_cache_timeout': PROFILE_HEADER_CACHE_TIMEOUT,
     }
     return render(request, template_name, context)
 
@@ -256,22 +411,22 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return get_user_object(self)
 
 
-class CommentUpdateView(LoginRequiredMixin, UpdateView):
-    """Вью класс для формы редактирования комментария."""
+class CommentAuthorMixin(LoginRequiredMixin, ObjectPermissionMixin):
+    """Комментарий текущего пользователя; чужой не найдётся."""
 
     model = Comment
     form_class = CommentForm
-    pk_url_kwarg = 'post_id'
+    pk_url_kwarg = 'comment_id'
     template_name = 'blog/comment.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        """Функция проверки формы."""
-        if request.GET and self.get_object().author != self.request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail', self.kwargs['post_id'])
-            )
-        get_comment_object(**kwargs)
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        """Комментарии пользователя к опубликованному посту с автором."""
+        return Comment.objects.select_related('author').filter(
+            post=self.kwargs['post_id'],
+            post__is_published=True,
+            post__deleted_at__isnull=True,
+            author=self.request.user,
+        )
 
     def get_success_url(self):
         """Функция получения адреса."""
@@ -280,47 +435,35 @@ class CommentUpdateView(LoginRequiredMixin, UpdateView):
             kwargs={'post_id': self.object.post_id}
         )
 
-    def get_object(self):
-        """Получение объекта пользователя."""
-        return get_object_or_404(
-            Comment,
-            post=self.kwargs['post_id'],
-            pk=self.kwargs['comment_id'],
-            post__is_published=True,
-            author=User.objects.get(username=self.request.user),
-        )
 
+class CommentUpdateView(CommentAuthorMixin, UpdateView):
+    """Вью класс для формы редактирования комментария."""
 
-class CommentDeleteView(LoginRequiredMixin, DeleteView):
-    """Вью класс для формы удаления комментария."""
+    def form_valid(self, form):
+        """Сохранение комментария и ответ фрагментом или переходом."""
+        fragment = get_fragment_format(self.request)
+        if not fragment:
+            return super().form_valid(form)
+        self.object = form.save()
+        return render_comment(self.request, self.object, fragment)
 
-    model = Comment
-    form_class = CommentForm
-    pk_url_kwarg = 'post_id'
-    template_name = 'blog/comment.html'
+    def form_invalid(self, form):
+        """Ошибки формы фрагментом или страницей с формой."""
+        fragment = get_fragment_format(self.request)
+        if not fragment:
+            return super().form_invalid(form)
+        return render_form_errors(form, fragment)
 
-    def dispatch(self, request, *args, **kwargs):
-        """Функция проверки формы."""
-        if request.GET and self.get_object().author != self.request.user:
-            return HttpResponseRedirect(
-                reverse('blog:post_detail', self.kwargs['post_id'])
-            )
-        get_comment_object(**kwargs)
-        return super().dispatch(request, *args, **kwargs)
 
-    def get_success_url(self):
-        """Функция получения адреса."""
-        return reverse_lazy(
-            'blog:post_detail',
-            kwargs={'post_id': self.object.post_id}
-        )
+class CommentDeleteView(CommentAuthorMixin, DeleteView):
+    """Вью класс для формы удаления комментария."""
 
-    def get_object(self):
-        """Получение объекта пользователя."""
-        return get_object_or_404(
-            Comment,
-            post=self.kwargs['post_id'],
-            pk=self.kwargs['comment_id'],
-            post__is_published=True,
-            author=User.objects.get(username=self.request.user),
-        )
+    def delete(self, request, *args, **kwargs):
+        """Удаление комментария и ответ фрагментом или переходом."""
+        fragment = get_fragment_format(request)
+        if not fragment:
+            return super().delete(request, *args, **kwargs)
+        self.object = self.get_object()
+        comment_id = self.object.pk
+        self.object.delete()
+        return render_deleted(comment_id, fragment)
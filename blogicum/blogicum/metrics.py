@@ -0,0 +1,273 @@
+"""Метрики запросов: задержка, SQL, рендеринг шаблонов и размер ответа.
+
+Метрики копятся в памяти процесса и отдаются в текстовом формате
+Prometheus по адресу /metrics/, а по каждому запросу пишется строка
+в лог `blogicum.metrics`.
+
+Счётчики запроса лежат в контекстной переменной. Её видят и потоки
+sync_to_async, в которых под ASGI выполняются запросы ORM, поэтому
+SQL замеряет постоянная обёртка на каждом соединении, а не обёртка,
+поставленная на соединения потока мидлвара.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.template.backends.django import DjangoTemplates
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+logger = logging.getLogger('blogicum.metrics')
+
+current_stats = ContextVar('current_stats', default=None)
+
+
+class RequestStats:
+    """Счётчики одного запроса; служит обёрткой execute_wrapper.
+
+    Запросы ORM одного запроса могут идти из нескольких потоков,
+    поэтому счётчики меняются под блокировкой.
+    """
+
+    def __init__(self):
+        """Пустые счётчики."""
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Замер времени выполнения SQL-запроса."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            with self.lock:
+                self.queries += 1
+                self.query_time += elapsed
+
+    def add_template_time(self, elapsed):
+        """Учёт времени рендеринга шаблона."""
+        with self.lock:
+            self.template_time += elapsed
+
+
+def record_query(execute, sql, params, many, context):
+    """Замер SQL-запроса, если идёт замер HTTP-запроса."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def instrument(connection):
+    """Постоянная обёртка замера SQL на соединении."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    """Обёртка для соединений, открытых в любом потоке."""
+    instrument(connection)
+
+
+class ViewMetrics:
+    """Накопленные метрики одной вью."""
+
+    def __init__(self):
+        """Нулевые метрики."""
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """Потокобезопасное хранилище метрик процесса."""
+
+    def __init__(self):
+        """Пустое хранилище."""
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+
+    def observe(self, view, duration, stats, response_bytes):
+        """Учёт завершённого запроса."""
+        with self.lock:
+            metrics = self.views[view]
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    metrics.buckets[index] += 1
+            metrics.count += 1
+            metrics.duration += duration
+            metrics.queries += stats.queries
+            metrics.query_time += stats.query_time
+            metrics.template_time += stats.template_time
+            metrics.response_bytes += response_bytes
+
+    def render(self):
+        """Метрики в текстовом формате Prometheus."""
+        lines = [
+            '# TYPE blogicum_request_duration_seconds histogram',
+            '# TYPE blogicum_db_queries_total counter',
+            '# TYPE blogicum_db_query_seconds_total counter',
+            '# TYPE blogicum_template_render_seconds_total counter',
+            '# TYPE blogicum_response_bytes_total counter',
+        ]
+        with self.lock:
+            for view, metrics in sorted(self.views.items()):
+                label = f'view="{view}"'
+                for bound, value in zip(LATENCY_BUCKETS, metrics.buckets):
+                    lines.append(
+                        'blogicum_request_duration_seconds_bucket'
+                        f'{{{label},le="{bound}"}} {value}'
+                    )
+                lines.extend((
+                    'blogicum_request_duration_seconds_bucket'
+                    f'{{{label},le="+Inf"}} {metrics.count}',
+                    'blogicum_request_duration_seconds_sum'
+                    f'{{{label}}} {metrics.duration:.6f}',
+                    'blogicum_request_duration_seconds_count'
+                    f'{{{label}}} {metrics.count}',
+                    f'blogicum_db_queries_total{{{label}}} {metrics.queries}',
+                    'blogicum_db_query_seconds_total'
+                    f'{{{label}}} {metrics.query_time:.6f}',
+                    'blogicum_template_render_seconds_total'
+                    f'{{{label}}} {metrics.template_time:.6f}',
+                    'blogicum_response_bytes_total'
+                    f'{{{label}}} {metrics.response_bytes}',
+                ))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Мидлвар, замеряющий каждый запрос.
+
+    Работает и в синхронном, и в асинхронном стеке: синхронный
+    мидлвар заставил бы Django под ASGI выполнять асинхронные вью
+    через async_to_sync в отдельном потоке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Запоминание следующего обработчика и режима стека."""
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django и asyncio узнают асинхронный мидлвар.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        """Выполнение запроса под замером."""
+        if self.is_async:
+            return self.__acall__(request)
+        for connection in connections.all():
+            instrument(connection)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        self.observe(request, response, stats, perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        """Выполнение запроса асинхронного стека под замером."""
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        self.observe(request, response, stats, perf_counter() - started)
+        return response
+
+    def observe(self, request, response, stats, duration):
+        """Учёт запроса в метриках процесса и строка в логе."""
+        if request.resolver_match:
+            view = request.resolver_match.view_name
+        else:
+            view = 'unresolved'
+        response_bytes = 0 if response.streaming else len(response.content)
+        registry.observe(view, duration, stats, response_bytes)
+        logger.info(json.dumps({
+            'view': view,
+            'method': request.method,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': stats.queries,
+            'query_ms': round(stats.query_time * 1000, 2),
+            'template_ms': round(stats.template_time * 1000, 2),
+            'bytes': response_bytes,
+        }))
+
+
+class TimedTemplate:
+    """Шаблон, учитывающий время рендеринга в метриках запроса."""
+
+    def __init__(self, template):
+        """Обёртка над шаблоном бэкенда."""
+        self.template = template
+
+    def __getattr__(self, name):
+        """Остальные атрибуты берутся у исходного шаблона."""
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        """Рендеринг шаблона под замером."""
+        stats = current_stats.get()
+        if stats is None:
+            return self.template.render(context, request)
+        started = perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.add_template_time(perf_counter() - started)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Бэкенд шаблонов Django с замером времени рендеринга."""
+
+    def from_string(self, template_code):
+        """Шаблон из строки с замером рендеринга."""
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        """Шаблон по имени с замером рендеринга."""
+        return TimedTemplate(super().get_template(template_name))
+
+
+def metrics_view(request):
+    """Выдача метрик для внутренних адресов и персонала."""
+    if (
+        request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS
+        and not request.user.is_staff
+    ):
+        raise Http404
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -5,10 +5,13 @@ from django.urls import include, path, reverse_lazy
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path('', include('blog.urls')),
     path('pages/', include('pages.urls')),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
@@ -0,0 +1,26 @@
+// Отправка комментария без перезагрузки страницы: сервер возвращает
+// HTML-фрагмент нового комментария, который добавляется в конец списка.
+// Без JavaScript форма работает как обычно, с переходом на страницу поста.
+document.querySelectorAll('[data-comment-form]').forEach(function (form) {
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    fetch(form.action, {
+      method: 'POST',
+      body: new FormData(form),
+      headers: {'X-Requested-With': 'XMLHttpRequest'},
+      credentials: 'same-origin',
+    }).then(function (response) {
+      if (!response.ok) {
+        form.submit();
+        return;
+      }
+      return response.text().then(function (html) {
+        document.getElementById('comments')
+          .insertAdjacentHTML('beforeend', html);
+        form.reset();
+      });
+    }).catch(function () {
+      form.submit();
+    });
+  });
+});
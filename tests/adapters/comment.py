@@ -12,7 +12,7 @@ from conftest import COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS
 from fixtures.types import CommentModelAdapterT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def CommentModelAdapter(CommentModel: type) -> CommentModelAdapterT:
     class _CommentModelAdapter(StudentModelAdapter):
         """
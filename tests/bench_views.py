@@ -0,0 +1,45 @@
+"""Замеры страниц блога; запускаются явно: `pytest tests/bench_views.py -s`.
+
+Размер набора данных и пороги задаются переменными окружения
+BENCH_POSTS, BENCH_COMMENTS, BENCH_ITERATIONS и BENCH_MAX_P95_MS.
+"""
+import os
+
+import pytest
+from django.test import override_settings
+
+from blog.benchmark import (
+    format_result, get_bench_user, get_targets, percentiles, run_client
+)
+from blog.seeding import seed_dataset
+
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", 50))
+MAX_P95_MS = float(os.environ.get("BENCH_MAX_P95_MS", 500))
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def bench_dataset():
+    seed_dataset(
+        users=20,
+        categories=5,
+        locations=5,
+        posts=int(os.environ.get("BENCH_POSTS", 500)),
+        comments=int(os.environ.get("BENCH_COMMENTS", 2000)),
+        seed=0,
+    )
+
+
+@override_settings(BLOG_RATE_LIMITS={"add_comment": (10 ** 9, 1)})
+@pytest.mark.parametrize(
+    "name", ["index", "category", "profile", "detail", "add_comment"]
+)
+def test_view_latency(bench_dataset, name):
+    target = {target.name: target for target in get_targets()}[name]
+    result = run_client(target, ITERATIONS, get_bench_user())
+    print("\n" + format_result(result))
+    _, p95, _ = percentiles(result.timings)
+    assert p95 <= MAX_P95_MS, (
+        f"p95 страницы `{name}` превысил {MAX_P95_MS} мс: {p95:.2f} мс."
+    )
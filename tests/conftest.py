@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -26,6 +27,8 @@ from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
 
+from parallel_db import setup_test_databases
+
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -41,6 +44,33 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(
+        request, django_test_environment, django_db_blocker,
+        django_db_keepdb, django_db_createdb,
+):
+    yield from setup_test_databases(
+        request, django_db_blocker, django_db_keepdb, django_db_createdb
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def discard_view_buffer():
+    # Просмотры из буфера одного теста не должны попасть в базу
+    # посреди другого или после удаления тестовой базы.
+    from blog.view_counts import discard_views
+
+    discard_views()
+    yield
+    discard_views()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -93,6 +123,7 @@ pytest_plugins = [
     "fixtures.categories",
     "fixtures.comments",
     "adapters.comment",
+    "query_budget",
 ]
 
 
@@ -195,7 +226,7 @@ class _TestModelAttrs:
             assert model_field.__dict__.get(param) == value_param, value_error
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def PostModel() -> Type[Model]:
     try:
         from blog.models import Post
@@ -209,7 +240,7 @@ def PostModel() -> Type[Model]:
     return Post
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def CommentModel() -> Model:
     try:
         from blog import models
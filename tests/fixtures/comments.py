@@ -30,3 +30,13 @@ def comment_to_a_post(
     post_field_name = CommentModelAdapter(CommentModel).post.field.name
     mixer_kwargs = {post_field_name: post_with_published_location}
     return mixer.blend(f"blog.{comment_model_name}", **mixer_kwargs)
+
+
+@pytest.fixture
+def own_comment(mixer: Mixer, user: Model, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        author=user,
+        text="Текст",
+    )
@@ -88,6 +88,22 @@ def post_with_published_location(
     )
 
 
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category, published_location):
+    def make(text, title="Заголовок"):
+        return mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            location=published_location,
+            is_published=True,
+            pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1),
+            title=title,
+            text=text,
+        )
+    return make
+
+
 @pytest.fixture
 def many_posts_with_published_locations(
     mixer: Mixer, user, published_locations, published_category
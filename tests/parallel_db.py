@@ -0,0 +1,136 @@
+"""Тестовые базы для прогона в нескольких процессах (`pytest -n N`).
+
+Первый процесс xdist создаёт и мигрирует базу-шаблон, остальные ждут
+его на файловой блокировке; затем каждый процесс получает собственную
+копию шаблона. Шаблон пересоздаётся один раз за прогон, а с
+`--reuse-db` — только при `--create-db`. Копии удаляются по окончании.
+
+Модуль делает прогон с `-n` корректным, но сам его не ускоряет. На
+нынешнем наборе из сотни тестов запуск процессов дороже выигрыша: на
+одном ядре последовательный прогон занял 11,5 с, с `-n 2` — 18,2 с,
+с `-n 3` — 19,2 с. Поэтому по умолчанию тесты идут в одном процессе.
+"""
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connections
+from django.test.utils import setup_databases, teardown_databases
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+TEMPLATE_DIR = Path(tempfile.gettempdir())
+TEMPLATE_PREFIX = "blogicum_test_template"
+
+
+def get_worker_id(config):
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+
+def is_in_memory_sqlite(connection):
+    return (
+        connection.vendor == "sqlite"
+        and connection.creation.is_in_memory_db(
+            connection.settings_dict["TEST"]["NAME"] or ":memory:"
+        )
+    )
+
+
+def use_file_sqlite(name):
+    """Перевод тестовых баз SQLite из памяти в файлы, чтобы их копировать."""
+    for connection in connections.all():
+        if is_in_memory_sqlite(connection):
+            connection.settings_dict["TEST"]["NAME"] = str(
+                TEMPLATE_DIR / f"{name}_{connection.alias}.sqlite3"
+            )
+
+
+@contextmanager
+def template_lock():
+    with open(TEMPLATE_DIR / f"{TEMPLATE_PREFIX}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def is_template_fresh(run_id):
+    marker = TEMPLATE_DIR / f"{TEMPLATE_PREFIX}.run"
+    return marker.exists() and marker.read_text() == run_id
+
+
+def mark_template_fresh(run_id):
+    (TEMPLATE_DIR / f"{TEMPLATE_PREFIX}.run").write_text(run_id)
+
+
+def clone_for_worker(db_cfg, worker_id, verbosity):
+    """Копия шаблона для процесса; соединения переключаются на неё.
+
+    Возвращает имена баз-шаблонов по порядку соединений.
+    """
+    template_names = []
+    for connection, _, _ in db_cfg:
+        connection.close()
+        connection.creation.clone_test_db(
+            suffix=worker_id, verbosity=verbosity, keepdb=False
+        )
+        template_names.append(connection.settings_dict["NAME"])
+        connection.settings_dict.update(
+            connection.creation.get_test_db_clone_settings(worker_id)
+        )
+    return template_names
+
+
+def destroy_worker_clones(db_cfg, template_names, worker_id, verbosity):
+    for (connection, old_name, _), template_name in zip(
+            db_cfg, template_names
+    ):
+        connection.close()
+        connection.settings_dict["NAME"] = template_name
+        connection.creation.destroy_test_db(
+            old_name, verbosity, keepdb=False, suffix=worker_id
+        )
+
+
+def setup_test_databases(request, django_db_blocker, keepdb, createdb):
+    """Генератор для фикстуры `django_db_setup`."""
+    verbosity = request.config.option.verbose
+    reuse = keepdb and not createdb
+    worker_id = get_worker_id(request.config)
+
+    if worker_id is None or fcntl is None:
+        # Без копирования: с --reuse-db база процесса хранится в файле.
+        if reuse:
+            use_file_sqlite(
+                TEMPLATE_PREFIX if worker_id is None
+                else f"{TEMPLATE_PREFIX}_{worker_id}"
+            )
+        with django_db_blocker.unblock():
+            db_cfg = setup_databases(
+                verbosity=verbosity, interactive=False, keepdb=reuse
+            )
+        yield
+        if not reuse:
+            with django_db_blocker.unblock():
+                teardown_databases(db_cfg, verbosity=verbosity)
+        return
+
+    use_file_sqlite(TEMPLATE_PREFIX)
+    run_id = request.config.workerinput["testrunuid"]
+    with template_lock(), django_db_blocker.unblock():
+        fresh = is_template_fresh(run_id)
+        db_cfg = setup_databases(
+            verbosity=verbosity, interactive=False, keepdb=reuse or fresh
+        )
+        mark_template_fresh(run_id)
+        template_names = clone_for_worker(db_cfg, worker_id, verbosity)
+    yield
+    with django_db_blocker.unblock():
+        destroy_worker_clones(
+            db_cfg, template_names, worker_id, verbosity
+        )
@@ -0,0 +1,110 @@
+"""Контроль числа SQL-запросов на каждую вью, вызванную тестовым клиентом.
+
+Бюджеты хранятся в `tests/query_budgets.json` по ключу
+`<МЕТОД> <имя вью>`. Тест падает при выходе за бюджет любой вью,
+к которой он обращался. Обновить бюджеты по фактическим значениям:
+
+    pytest --update-query-budgets
+"""
+import json
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+BUDGETS_PATH = Path(__file__).parent / "query_budgets.json"
+
+observed_key = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-budgets",
+        action="store_true",
+        help="Записать наблюдаемое число SQL-запросов как новые бюджеты.",
+    )
+
+
+def pytest_configure(config):
+    config.stash[observed_key] = {}
+
+
+def load_budgets():
+    if not BUDGETS_PATH.exists():
+        return {}
+    return json.loads(BUDGETS_PATH.read_text(encoding="utf-8"))
+
+
+def get_view_key(request_kwargs):
+    try:
+        match = resolve(request_kwargs["PATH_INFO"])
+    except Resolver404:
+        return None
+    return f"{request_kwargs['REQUEST_METHOD']} {match.view_name}"
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request, monkeypatch):
+    observed = {}
+    original_request = Client.request
+
+    def request_with_count(client, **request_kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = original_request(client, **request_kwargs)
+        key = get_view_key(request_kwargs)
+        if key is not None:
+            observed[key] = max(observed.get(key, 0), len(queries))
+        return response
+
+    monkeypatch.setattr(Client, "request", request_with_count)
+    yield
+
+    merge_observed(request.config, observed)
+    if request.config.getoption("--update-query-budgets"):
+        return
+    budgets = load_budgets()
+    exceeded = [
+        f"{key}: {count} > {budgets[key]}"
+        for key, count in sorted(observed.items())
+        if key in budgets and count > budgets[key]
+    ]
+    if exceeded:
+        pytest.fail(
+            "Число SQL-запросов превысило бюджет "
+            f"({BUDGETS_PATH.name}):\n" + "\n".join(exceeded),
+            pytrace=False,
+        )
+
+
+def merge_observed(config, observed):
+    session_observed = config.stash[observed_key]
+    for key, count in observed.items():
+        session_observed[key] = max(session_observed.get(key, 0), count)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Наблюдения процесса xdist передаются в основной процесс."""
+    merge_observed(
+        node.config, node.workeroutput.get("query_budget_observed", {})
+    )
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not config.getoption("--update-query-budgets"):
+        return
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["query_budget_observed"] = (
+            config.stash[observed_key]
+        )
+        return
+    budgets = load_budgets()
+    budgets.update(config.stash[observed_key])
+    BUDGETS_PATH.write_text(
+        json.dumps(budgets, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
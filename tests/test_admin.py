@@ -0,0 +1,113 @@
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import paginator
+from blog.models import Comment, Post, UserStats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _run_action(admin_client, model_name, action, objects):
+    return admin_client.post(
+        f"/admin/blog/{model_name}/",
+        {
+            "action": action,
+            ACTION_CHECKBOX_NAME: [obj.pk for obj in objects],
+        },
+    )
+
+
+def test_post_publish_actions(
+    admin_client, many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations[:3]
+    _run_action(admin_client, "post", "unpublish", posts)
+    assert Post.objects.filter(is_published=False).count() == len(posts), (
+        "Убедитесь, что действие админки снимает выбранные публикации"
+        " с публикации."
+    )
+    _run_action(admin_client, "post", "publish", posts)
+    assert not Post.objects.filter(is_published=False).exists()
+
+
+def test_post_delete_with_comments(
+    admin_client, mixer, post_with_published_location, post_of_another_author
+):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    kept = mixer.blend("blog.Comment", post=post_of_another_author)
+    _run_action(
+        admin_client, "post", "delete_with_comments",
+        [post_with_published_location],
+    )
+    assert list(Post.objects.all()) == [post_of_another_author]
+    assert list(Comment.objects.all()) == [kept], (
+        "Убедитесь, что вместе с публикацией удаляются только её"
+        " комментарии."
+    )
+
+
+def test_delete_all_comments_by_author(
+    admin_client, mixer, user, another_user, post_with_published_location
+):
+    spam = mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location, author=another_user
+    )
+    kept = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    _run_action(admin_client, "comment", "delete_all_by_authors", spam[:1])
+    assert list(Comment.objects.all()) == [kept], (
+        "Убедитесь, что действие удаляет все комментарии авторов выбранных"
+        " комментариев."
+    )
+
+
+@pytest.mark.parametrize(
+    "action", ("delete_comments", "delete_all_by_authors")
+)
+def test_comment_actions_query_count(
+    admin_client, mixer, another_user, post_with_published_location, action
+):
+    def run(count):
+        comments = mixer.cycle(count).blend(
+            "blog.Comment",
+            post=post_with_published_location,
+            author=another_user,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            _run_action(admin_client, "comment", action, comments)
+        assert not Comment.objects.exists()
+        return len(queries)
+
+    assert run(2) == run(40), (
+        "Убедитесь, что число запросов при удалении комментариев"
+        " не зависит от числа комментариев."
+    )
+    assert UserStats.objects.get(user=another_user).comment_count == 0, (
+        "Убедитесь, что после удаления комментариев статистика их"
+        " авторов пересчитывается."
+    )
+
+
+def test_post_changelist_uses_estimated_count(
+    admin_client, monkeypatch, many_posts_with_published_locations
+):
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    assert paginator.estimate_count(Post) == len(
+        many_posts_with_published_locations
+    ), "Убедитесь, что оценка числа строк берётся из статистики базы."
+
+    monkeypatch.setattr(paginator, "ESTIMATED_COUNT_THRESHOLD", 1)
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/post/")
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == len(
+        many_posts_with_published_locations
+    )
+    assert not [
+        query["sql"] for query in queries.captured_queries
+        if 'COUNT(*)' in query["sql"] and '"blog_post"' in query["sql"]
+    ], "Убедитесь, что список публикаций в админке не считает строки."
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.http import Http404
+from django.test import AsyncRequestFactory
+
+from blog import async_views
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get(path, user=None):
+    request = AsyncRequestFactory().get(path)
+    request.user = user or AnonymousUser()
+    return request
+
+
+def test_async_feed_pages(post_with_published_location):
+    post = post_with_published_location
+    for view, kwargs in (
+        (async_views.index, {}),
+        (
+            async_views.category_posts,
+            {"category_slug": post.category.slug},
+        ),
+        (async_views.profile, {"username": post.author.username}),
+    ):
+        response = async_to_sync(view)(_get("/"), **kwargs)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode("utf-8"), (
+            "Убедитесь, что асинхронные страницы ленты показывают"
+            " опубликованные посты."
+        )
+
+
+def test_async_detail_hides_unpublished(
+    post_with_published_location, another_user
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    view = async_to_sync(async_views.PostDetailView.as_view())
+
+    response = view(_get(f"/posts/{post.id}/", post.author), post_id=post.id)
+    assert response.status_code == HTTPStatus.OK
+    with pytest.raises(Http404):
+        view(_get(f"/posts/{post.id}/", another_user), post_id=post.id)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compare_async_views_command(post_with_published_location):
+    out = StringIO()
+    call_command("compare_async_views", requests=2, concurrency=1, stdout=out)
+    lines = out.getvalue().splitlines()
+    for page in ("index", "category", "profile", "detail"):
+        for mode in ("wsgi", "asgi"):
+            assert any(line.split()[:2] == [page, mode] for line in lines), (
+                "Убедитесь, что `compare_async_views` проводит страницы"
+                " через синхронный и асинхронный обработчики."
+            )
@@ -0,0 +1,19 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, UserStats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_bench_blog_leaves_no_comments(post_with_published_location):
+    stdout = StringIO()
+    call_command("bench_blog", "--iterations", "3", stdout=stdout)
+    assert "add_comment" in stdout.getvalue()
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что комментарии из замера не остаются в базе."
+    )
+    author = post_with_published_location.author
+    assert UserStats.objects.get(user=author).comment_count == 0
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import category_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_page_skips_category_lookup(
+    user_client, published_category
+):
+    url = f"/category/{published_category.slug}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    with CaptureQueriesContext(connection) as queries:
+        assert user_client.get(url).status_code == HTTPStatus.OK
+    assert not [
+        query for query in queries
+        if 'FROM "blog_category"' in query["sql"]
+    ], (
+        "Убедитесь, что повторный запрос страницы категории берёт"
+        " категорию из кэша, а не из базы."
+    )
+
+
+def test_category_change_refreshes_cache(
+    user_client, published_category, django_capture_on_commit_callbacks
+):
+    url = f"/category/{published_category.slug}/"
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    with django_capture_on_commit_callbacks(execute=True):
+        published_category.title = "Новое название"
+        published_category.save()
+    assert "Новое название" in user_client.get(url).content.decode("utf-8")
+
+    published_category.is_published = False
+    published_category.save()
+    assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что снятая с публикации категория сразу пропадает"
+        " из кэша категорий."
+    )
+
+
+def test_category_cache_follows_shared_version(published_category):
+    categories = category_cache.get_published_categories()
+    assert published_category.slug in categories
+    assert category_cache.get_published_categories() is categories
+    category_cache.bump_version()
+    assert category_cache.get_published_categories() is not categories, (
+        "Убедитесь, что процесс перечитывает категории после смены"
+        " версии в общем кэше."
+    )
+
+
+def test_category_cache_expires_without_shared_version(
+    published_category, monkeypatch
+):
+    now = 1000.0
+    monkeypatch.setattr(
+        category_cache, "time", SimpleNamespace(monotonic=lambda: now)
+    )
+    categories = category_cache.get_published_categories()
+    now += category_cache.CATEGORY_CACHE_MAX_AGE - 1
+    assert category_cache.get_published_categories() is categories
+    now += 1
+    assert category_cache.get_published_categories() is not categories, (
+        "Убедитесь, что процесс перечитывает категории по истечении"
+        " CATEGORY_CACHE_MAX_AGE, даже если версия в кэше не сменилась."
+    )
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+XHR = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
+JSON = {"HTTP_ACCEPT": "application/json"}
+
+
+def test_add_comment_returns_fragment(
+    user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    response = user_client.post(url, {"text": "Новый комментарий"}, **XHR)
+    assert response.status_code == HTTPStatus.CREATED, (
+        "Убедитесь, что запрос из JavaScript получает фрагмент нового"
+        " комментария вместо перехода на страницу поста."
+    )
+    comment = Comment.objects.get()
+    content = response.content.decode("utf-8")
+    assert f'id="comment-{comment.id}"' in content
+    assert "Новый комментарий" in content
+
+    response = user_client.post(url, {"text": "Ещё"}, **JSON)
+    assert response.status_code == HTTPStatus.CREATED
+    assert "Ещё" in response.json()["html"]
+
+    response = user_client.post(url, {"text": ""}, **JSON)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "text" in response.json()["errors"]
+
+
+def test_add_comment_keeps_redirect(
+    user_client, post_with_published_location
+):
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        {"text": "Комментарий"},
+    )
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_edit_and_delete_comment_fragments(user_client, own_comment):
+    base = f"/posts/{own_comment.post_id}"
+    response = user_client.post(
+        f"{base}/edit_comment/{own_comment.id}/", {"text": "Правка"}, **JSON
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["id"] == own_comment.id
+    assert "Правка" in response.json()["html"]
+
+    response = user_client.post(
+        f"{base}/delete_comment/{own_comment.id}/", **XHR
+    )
+    assert response.status_code == HTTPStatus.NO_CONTENT, (
+        "Убедитесь, что удаление комментария из JavaScript отвечает"
+        " без перехода на страницу поста."
+    )
+    assert not Comment.objects.exists()
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.models import Comment, DeletionTask, Post, UserStats
+
+pytestmark = [pytest.mark.django_db]
+
+User = get_user_model()
+
+
+@pytest.fixture
+def commented_post(user, another_user, post_with_published_location):
+    post = post_with_published_location
+    for number in range(3):
+        Comment.objects.create(
+            post=post, author=another_user, text=f"Комментарий {number}"
+        )
+    return post
+
+
+def get_feed_size(client):
+    return client.get("/").context["page_obj"].paginator.count
+
+
+def test_post_hidden_then_reaped(user_client, another_user, commented_post):
+    post = commented_post
+    assert get_feed_size(user_client) == 1
+    response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+
+    assert user_client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    ), "Убедитесь, что удалённая публикация сразу скрывается с сайта."
+    assert get_feed_size(user_client) == 0, (
+        "Убедитесь, что удалённая публикация не учитывается в размере ленты."
+    )
+    assert Comment.objects.filter(post_id=post.id).count() == 3, (
+        "Убедитесь, что комментарии удаляются командой `reap_deleted`,"
+        " а не при обработке запроса."
+    )
+    stats = UserStats.objects.get(user=another_user)
+    assert stats.comment_count == 0, (
+        "Убедитесь, что комментарии к скрытой публикации сразу вычитаются"
+        " из статистики их авторов."
+    )
+
+    call_command("reap_deleted", batch_size=2, max_batches=1)
+    task = DeletionTask.objects.get(object_id=post.id)
+    assert (task.comments_deleted, task.finished_at) == (2, None), (
+        "Убедитесь, что `reap_deleted` удаляет комментарии пачками"
+        " и сохраняет ход работы."
+    )
+
+    call_command("reap_deleted", batch_size=2)
+    task.refresh_from_db()
+    assert (task.comments_deleted, task.posts_deleted) == (3, 1)
+    assert task.finished_at is not None
+    assert not Post.all_objects.filter(pk=post.id).exists()
+    assert not Comment.objects.filter(post_id=post.id).exists()
+    assert UserStats.objects.get(user=another_user).comment_count == 0
+
+
+def test_admin_user_deletion(
+    admin_client, user, another_user, commented_post
+):
+    Comment.objects.create(post=commented_post, author=user, text="Своё")
+    response = admin_client.post(
+        f"/admin/auth/user/{user.id}/delete/", {"post": "yes"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    user.refresh_from_db()
+    assert not user.is_active, (
+        "Убедитесь, что удаление пользователя в админке сразу отключает его."
+    )
+    assert admin_client.get(f"/profile/{user.username}/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert not Post.objects.filter(author=user).exists()
+    assert UserStats.objects.get(user=another_user).comment_count == 0
+
+    call_command("reap_deleted", batch_size=3)
+    task = DeletionTask.objects.get(kind=DeletionTask.USER)
+    assert (task.comments_deleted, task.posts_deleted) == (4, 1)
+    assert not User.objects.filter(pk=user.id).exists(), (
+        "Убедитесь, что `reap_deleted` удаляет пользователя после его"
+        " публикаций и комментариев."
+    )
+    assert User.objects.filter(pk=another_user.id).exists()
+
+
+def test_deleted_user_comments_hidden_at_once(
+    admin_client, client, user, another_user, post_of_another_author
+):
+    post = post_of_another_author
+    Comment.objects.create(post=post, author=user, text="Чужая публикация")
+    admin_client.post(f"/admin/auth/user/{user.id}/delete/", {"post": "yes"})
+    response = client.get(f"/posts/{post.id}/")
+    assert not list(response.context["comments"]), (
+        "Убедитесь, что комментарии удаляемого пользователя к чужим"
+        " публикациям сразу скрываются."
+    )
+    card = client.get("/").context["page_obj"][0]
+    assert card.comment_count == 0, (
+        "Убедитесь, что скрытые комментарии не учитываются в карточке"
+        " публикации."
+    )
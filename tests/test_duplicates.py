@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.constants import MINHASH_BANDS
+from blog.minhash import get_signature, get_similarity
+from blog.models import FingerprintBucket, Post, PostFingerprint
+
+pytestmark = [pytest.mark.django_db]
+
+SPAM = (
+    "Лучшие кредиты без проверки по ссылке в профиле, одобрение за пять"
+    " минут, звоните прямо сейчас и получите бонус на первый заказ"
+)
+
+
+def get_original_id(post):
+    return PostFingerprint.objects.get(post=post).duplicate_of_id
+
+
+def test_signature_similarity():
+    assert get_similarity(
+        get_signature(SPAM), get_signature(SPAM.upper() + "!")
+    ) == 1, "Убедитесь, что подпись не зависит от регистра и пунктуации."
+    assert get_similarity(
+        get_signature(SPAM), get_signature("Сегодня хорошая погода у моря")
+    ) < 0.2
+    assert get_signature(" ... ") is None
+
+
+def test_created_copy_is_flagged(
+    user_client, make_post, published_category, published_location
+):
+    original = make_post(SPAM)
+    make_post("Заметки о поездке в горы и о погоде у моря")
+    response = user_client.post(
+        "/posts/create/",
+        {
+            "title": "Копия",
+            "text": SPAM + " сегодня",
+            "pub_date": timezone.now().date(),
+            "category": published_category.id,
+            "location": published_location.id,
+            "is_published": True,
+        },
+    )
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что почти одинаковая публикация не отклоняется,"
+        " а только отмечается."
+    )
+    copy = Post.objects.get(title="Копия")
+    assert get_original_id(copy) == original.id, (
+        "Убедитесь, что при создании публикации отмечается, копией"
+        " какой ранней публикации она выглядит."
+    )
+    assert get_original_id(original) is None
+
+
+def test_edited_text_is_refingerprinted(make_post):
+    make_post(SPAM)
+    post = make_post("Заметки о поездке в горы и о погоде у моря")
+    assert get_original_id(post) is None
+    post.text = SPAM
+    post.save()
+    assert get_original_id(post) is not None, (
+        "Убедитесь, что подпись пересчитывается при изменении текста."
+    )
+    assert FingerprintBucket.objects.filter(post=post).count() == (
+        MINHASH_BANDS
+    ), "Убедитесь, что корзины прежнего текста удаляются."
+
+
+def test_admin_duplicate_filter(admin_client, make_post):
+    original = make_post(SPAM)
+    copy = make_post(SPAM)
+    response = admin_client.get("/admin/blog/post/?duplicate=yes")
+    assert list(response.context["cl"].result_list) == [copy], (
+        "Убедитесь, что в админке есть фильтр копий других публикаций."
+    )
+    response = admin_client.get("/admin/blog/post/?duplicate=no")
+    assert list(response.context["cl"].result_list) == [original]
+
+
+def test_fingerprint_posts_command(make_post):
+    original = make_post(SPAM)
+    copy = make_post(SPAM)
+    PostFingerprint.objects.all().delete()
+    FingerprintBucket.objects.all().delete()
+    call_command("fingerprint_posts", batch_size=1)
+    assert get_original_id(original) is None
+    assert get_original_id(copy) == original.id, (
+        "Убедитесь, что `fingerprint_posts` отмечает копии среди"
+        " публикаций, вставленных без save()."
+    )
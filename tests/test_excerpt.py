@@ -0,0 +1,40 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from blog.views import get_post_object
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{index}" for index in range(30))
+
+
+def test_excerpt_is_saved_with_text(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == " ".join(LONG_TEXT.split()[:10]) + " …", (
+        "Убедитесь, что отрывок публикации пересчитывается при"
+        " сохранении текста."
+    )
+
+
+def test_feed_does_not_load_text(post_with_published_location):
+    post = get_post_object().get()
+    assert "text" in post.get_deferred_fields(), (
+        "Убедитесь, что лента не загружает полный текст публикаций."
+    )
+    assert post.excerpt
+
+
+def test_backfill_excerpts(post_with_published_location):
+    Post.objects.update(excerpt="")
+    call_command("backfill_excerpts", stdout=StringIO())
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.excerpt, (
+        "Убедитесь, что команда `backfill_excerpts` заполняет пустые"
+        " отрывки."
+    )
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import paginator
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_feed_count(client, url="/"):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    counted = any("COUNT(*)" in query["sql"] for query in queries)
+    return response.context["page_obj"].paginator.count, counted
+
+
+def blend_post(mixer, **kwargs):
+    fields = {
+        "is_published": True,
+        "category__is_published": True,
+        "pub_date": timezone.now() - timedelta(days=1),
+    }
+    fields.update(kwargs)
+    return mixer.blend("blog.Post", **fields)
+
+
+def test_feed_count_is_cached_and_maintained(mixer, user_client):
+    post = blend_post(mixer)
+    assert get_feed_count(user_client) == (1, True)
+    assert get_feed_count(user_client) == (1, False), (
+        "Убедитесь, что размер ленты берётся из кэша без COUNT(*)."
+    )
+
+    another = blend_post(mixer, category=post.category)
+    assert get_feed_count(user_client) == (2, False), (
+        "Убедитесь, что новая публикация увеличивает закэшированный"
+        " размер ленты."
+    )
+    post.is_published = False
+    post.save()
+    assert get_feed_count(user_client) == (1, False)
+    another.delete()
+    assert get_feed_count(user_client) == (0, False)
+    post.is_published = True
+    post.save()
+    assert get_feed_count(
+        user_client, f"/category/{post.category.slug}/"
+    ) == (1, True)
+    assert get_feed_count(
+        user_client, f"/category/{post.category.slug}/"
+    ) == (1, False)
+
+
+def test_feed_counts_reset_on_category_change(mixer, user_client):
+    post = blend_post(mixer)
+    assert get_feed_count(user_client) == (1, True)
+    post.category.is_published = False
+    post.category.save()
+    assert get_feed_count(user_client) == (0, True), (
+        "Убедитесь, что изменение категории сбрасывает размеры лент."
+    )
+
+
+def test_bulk_update_resets_feed_counts(mixer, user_client, admin_client):
+    post = blend_post(mixer)
+    assert get_feed_count(user_client) == (1, True)
+    admin_client.post(
+        "/admin/blog/post/",
+        {"action": "unpublish", "_selected_action": [post.pk]},
+    )
+    assert get_feed_count(user_client) == (0, True)
+
+
+def test_index_count_ignores_table_estimate(mixer, user_client, monkeypatch):
+    blend_post(mixer)
+    blend_post(mixer, is_published=False)
+    monkeypatch.setattr(paginator, "ESTIMATED_COUNT_THRESHOLD", 1)
+    monkeypatch.setattr(
+        paginator, "estimate_count", lambda model, using: 1000
+    )
+    assert get_feed_count(user_client) == (1, True), (
+        "Убедитесь, что размер ленты не берётся из оценки числа строк"
+        " всей таблицы: в неё входят и скрытые публикации."
+    )
+    response = user_client.get("/?page=last")
+    assert response.context["page_obj"].number == 1
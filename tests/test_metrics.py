@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+
+from blog.models import Post
+from blogicum.metrics import MetricsMiddleware, registry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_metrics_endpoint(client, post_with_published_location):
+    assert client.get("/").status_code == HTTPStatus.OK
+    response = client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode("utf-8")
+    for metric in (
+        'blogicum_request_duration_seconds_count{view="blog:index"}',
+        'blogicum_db_queries_total{view="blog:index"}',
+        'blogicum_template_render_seconds_total{view="blog:index"}',
+        'blogicum_response_bytes_total{view="blog:index"}',
+    ):
+        assert metric in content, (
+            f"Убедитесь, что на странице метрик выводится `{metric}`."
+        )
+
+
+def test_metrics_hidden_from_outside(client):
+    response = client.get("/metrics/", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_stack_is_not_adapted(settings, caplog):
+    settings.MIDDLEWARE = [
+        name for name in settings.MIDDLEWARE if "debug_toolbar" not in name
+    ]
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        ASGIHandler()
+    assert not [
+        record for record in caplog.records if "adapted" in record.message
+    ], (
+        "Убедитесь, что мидлвар метрик поддерживает асинхронный стек"
+        " и не заставляет Django переводить вью в синхронный режим."
+    )
+
+
+def select_one():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+def test_async_request_metrics(post_with_published_location):
+    async def view(request):
+        await sync_to_async(Post.objects.count)()
+        # Соединение другого потока открывается уже во время запроса.
+        await sync_to_async(select_one, thread_sensitive=False)()
+        return HttpResponse("ok")
+
+    middleware = MetricsMiddleware(view)
+    assert asyncio.iscoroutinefunction(middleware)
+    before = registry.views["unresolved"].queries
+    response = async_to_sync(middleware)(AsyncRequestFactory().get("/"))
+    assert response.status_code == HTTPStatus.OK
+    assert registry.views["unresolved"].queries - before == 2, (
+        "Убедитесь, что в асинхронных запросах учитываются SQL-запросы"
+        " из потоков sync_to_async."
+    )
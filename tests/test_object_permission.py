@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_lookups(queries, table):
+    return sum(
+        query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+        for query in queries
+    )
+
+
+def request_lookups(method, url, table, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = method(url, data or {})
+    return response, count_lookups(context.captured_queries, table)
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_loaded_once(action, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/{action}/"
+    response, lookups = request_lookups(user_client.get, url, "blog_post")
+    assert response.status_code == HTTPStatus.OK
+    assert lookups == 1, (
+        f"Убедитесь, что страница `{url}` загружает публикацию из базы"
+        " один раз за запрос."
+    )
+
+    data = {
+        "title": "Новый заголовок",
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+        "category": post.category_id,
+        "location": post.location_id,
+    }
+    response, lookups = request_lookups(
+        user_client.post, url, "blog_post", data
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert lookups == 1, (
+        f"Убедитесь, что отправка формы на `{url}` загружает публикацию"
+        " из базы один раз за запрос."
+    )
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_foreign_post_checked_once(
+    action, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/{action}/"
+    response, lookups = request_lookups(
+        another_user_client.post, url, "blog_post"
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f"/posts/{post.id}/"
+    assert lookups == 1, (
+        "Убедитесь, что проверка прав на чужую публикацию обходится"
+        " одним запросом к ней."
+    )
+    assert Post.objects.filter(pk=post.pk, title=post.title).exists()
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_loaded_once(action, user_client, own_comment):
+    url = f"/posts/{own_comment.post_id}/{action}/{own_comment.id}/"
+    for method, data in (
+        (user_client.get, None),
+        (user_client.post, {"text": "Правка"}),
+    ):
+        response, lookups = request_lookups(method, url, "blog_comment", data)
+        assert response.status_code in (HTTPStatus.OK, HTTPStatus.FOUND)
+        assert lookups == 1, (
+            f"Убедитесь, что страница `{url}` загружает комментарий из базы"
+            " один раз за запрос."
+        )
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_foreign_comment_not_found(action, another_user_client, own_comment):
+    url = f"/posts/{own_comment.post_id}/{action}/{own_comment.id}/"
+    with CaptureQueriesContext(connection) as context:
+        response = another_user_client.post(url, {"text": "Правка"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert count_lookups(context.captured_queries, "auth_user") == 1, (
+        "Убедитесь, что проверка автора комментария не ищет пользователя"
+        " в базе повторно."
+    )
+    assert Comment.objects.get(pk=own_comment.pk).text == "Текст"
@@ -0,0 +1,30 @@
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+
+def render_paginator(query):
+    request = RequestFactory().get("/", query)
+    page_obj = Paginator(range(200000 * 10), 10).get_page(query["page"])
+    return render_to_string(
+        "includes/paginator.html", {"page_obj": page_obj}, request
+    )
+
+
+def test_paginator_renders_elided_window():
+    html = render_paginator({"page": 50000})
+    assert html.count('class="page-item') < 20, (
+        "Убедитесь, что пагинатор выводит ограниченное число ссылок"
+        " независимо от длины ленты."
+    )
+    for number in (1, 49999, 50000, 50001, 200000):
+        assert f">{number}<" in html
+    assert "…" in html
+
+
+def test_paginator_keeps_query_params():
+    html = render_paginator({"page": 2, "q": "поиск"})
+    assert "?page=3&amp;q=%D0%BF%D0%BE%D0%B8%D1%81%D0%BA" in html, (
+        "Убедитесь, что ссылки пагинатора сохраняют остальные параметры"
+        " запроса."
+    )
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_page_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return len(queries)
+
+
+def blend_posts(mixer, count, **kwargs):
+    return mixer.cycle(count).blend(
+        "blog.Post",
+        is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("url", ("/", "/category/{slug}/"))
+def test_feed_queries_do_not_grow_with_cards(mixer, user_client, url):
+    post = blend_posts(mixer, 1)[0]
+    url = url.format(slug=post.category.slug)
+    count_page_queries(user_client, url)
+    single = count_page_queries(user_client, url)
+    blend_posts(mixer, 9, category=post.category, location__is_published=True)
+    assert count_page_queries(user_client, url) == single, (
+        "Убедитесь, что данные карточек ленты выбираются одним запросом"
+        " вместе с публикациями."
+    )
+
+
+def test_card_fields_are_annotated(mixer, user_client):
+    hidden = mixer.blend("blog.Location", is_published=False)
+    shown = mixer.blend("blog.Location", is_published=True)
+    blend_posts(mixer, 2, location=mixer.sequence(hidden, shown))
+    posts = {
+        post.location_id: post
+        for post in user_client.get("/").context["page_obj"]
+    }
+    assert posts[hidden.id].location_label == "Планета Земля"
+    assert posts[shown.id].location_label == shown.name
+    post = posts[shown.id]
+    assert post.author_username == Post.objects.get(
+        pk=post.pk
+    ).author.username
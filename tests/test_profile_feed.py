@@ -0,0 +1,56 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.views import get_author_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_profile_feed_shows_only_author_posts(
+    mixer, user, another_user_client, published_category,
+    post_with_published_location, unpublished_posts_with_published_locations,
+):
+    mixer.blend(
+        "blog.Post",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = another_user_client.get(f"/profile/{user.username}/")
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context["page_obj"]) == [
+        post_with_published_location
+    ], (
+        "Убедитесь, что на странице чужого профиля выводятся только"
+        " опубликованные публикации этого автора."
+    )
+
+
+def test_profile_feed_shows_hidden_posts_to_author(
+    user, unpublished_posts_with_published_locations,
+):
+    assert get_author_posts(user, show_hidden=True).count() == len(
+        unpublished_posts_with_published_locations
+    )
+    assert not get_author_posts(user).exists()
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="План запроса SQLite."
+)
+@pytest.mark.parametrize("show_hidden", (False, True))
+def test_profile_feed_uses_author_index(user, show_hidden):
+    plan = get_author_posts(user, show_hidden)[:10].explain()
+    assert "post_author_published_idx" in plan, (
+        "Убедитесь, что лента профиля выбирается по индексу"
+        " (author, is_published, pub_date)."
+    )
+    if not show_hidden:
+        assert "TEMP B-TREE" not in plan, (
+            "Убедитесь, что публикации профиля читаются из индекса"
+            " в порядке даты публикации, без сортировки."
+        )
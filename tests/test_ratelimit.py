@@ -0,0 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog import ratelimit
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_RATE_LIMITS={"add_comment": (2, 60)})
+def test_comment_rate_limit(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    for _ in range(2):
+        response = user_client.post(url, {"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что при исчерпании бюджета комментариев возвращается"
+        " статус 429."
+    )
+    assert int(response["Retry-After"]) > 0, (
+        "Убедитесь, что ответ 429 содержит заголовок `Retry-After`."
+    )
+    assert post_with_published_location.comments.count() == 2
+
+
+@override_settings(BLOG_RATE_LIMITS={"add_comment": (1, 60)})
+def test_rate_limit_is_per_user(
+    user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    assert user_client.post(url, {"text": "a"}).status_code == HTTPStatus.FOUND
+    assert another_user_client.post(
+        url, {"text": "b"}
+    ).status_code == HTTPStatus.FOUND
+    assert user_client.get(
+        f"/posts/{post_with_published_location.id}/"
+    ).status_code == HTTPStatus.OK
+
+
+class SlowCache:
+    """Кэш с сетевой задержкой перед каждой операцией."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getattr__(self, name):
+        operation = getattr(self.cache, name)
+
+        def delayed(*args, **kwargs):
+            time.sleep(0.01)
+            return operation(*args, **kwargs)
+        return delayed
+
+
+@override_settings(BLOG_RATE_LIMITS={"add_comment": (3, 60)})
+def test_concurrent_burst_is_limited(monkeypatch):
+    cache = SlowCache(caches["default"])
+    monkeypatch.setattr(ratelimit, "get_rate_limit_cache", lambda: cache)
+    view = ratelimit.rate_limit("add_comment")(lambda request: HttpResponse())
+    barrier = threading.Barrier(12)
+
+    def post(_):
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.2")
+        request.user = AnonymousUser()
+        barrier.wait()
+        return view(request).status_code
+
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        statuses = list(executor.map(post, range(12)))
+    assert statuses.count(HTTPStatus.OK) == 3, (
+        "Убедитесь, что одновременные запросы не превышают бюджет записи."
+    )
@@ -0,0 +1,60 @@
+import pytest
+
+from blog import hll
+from blog.models import PostReaders, UserStats
+from blog.view_counts import flush_views, record_view
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_sketch(readers):
+    sketch = hll.empty_sketch()
+    for reader in readers:
+        hll.add(sketch, reader)
+    return sketch
+
+
+@pytest.mark.parametrize("total", [10, 1000, 20000])
+def test_estimate_error(total):
+    estimate = hll.estimate(make_sketch(f"user:{n}" for n in range(total)))
+    assert abs(estimate - total) <= max(2, total * 0.1), (
+        "Убедитесь, что оценка числа читателей отличается от точной"
+        " не больше чем на 10%."
+    )
+
+
+def test_merge_is_union():
+    left = make_sketch(f"user:{n}" for n in range(600))
+    right = make_sketch(f"user:{n}" for n in range(400, 1000))
+    merged = hll.merge(left, right)
+    assert merged == hll.merge(right, left, left)
+    assert len(merged) == hll.REGISTERS
+    assert abs(hll.estimate(merged) - 1000) <= 100, (
+        "Убедитесь, что объединение скетчей считает общих читателей"
+        " один раз."
+    )
+
+
+def test_readers_flushed_per_post_and_author(
+    user, user_client, another_user_client, unlogged_client,
+    post_with_published_location,
+):
+    post = post_with_published_location
+    for client in (user_client, another_user_client, another_user_client):
+        client.get(f"/posts/{post.id}/")
+    flush_views()
+    record_view(post.id, "ip:127.0.0.2")
+    flush_views()
+
+    sketch = PostReaders.objects.get(post=post)
+    assert sketch.reader_count == 3, (
+        "Убедитесь, что повторные просмотры одного читателя не увеличивают"
+        " число уникальных читателей публикации."
+    )
+    assert UserStats.objects.get(user=user).reader_count == 3, (
+        "Убедитесь, что скетч публикации сливается в скетч её автора."
+    )
+    content = unlogged_client.get(
+        f"/profile/{user.username}/"
+    ).content.decode("utf-8")
+    assert "Читателей: 3" in content
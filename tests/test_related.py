@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post, RelatedPost
+
+pytestmark = [pytest.mark.django_db]
+
+TOPICS = (
+    "виноград лоза урожай",
+    "телескоп орбита комета",
+    "велосипед педаль цепь",
+    "рецепт тесто духовка",
+    "парус якорь штурвал",
+    "скрипка смычок струна",
+)
+
+
+@pytest.fixture
+def topic_posts(make_post):
+    return [
+        (make_post(f"{topic} первая{n}"), make_post(f"{topic} вторая{n}"))
+        for n, topic in enumerate(TOPICS)
+    ]
+
+
+def get_related_ids(post):
+    return list(
+        RelatedPost.objects.filter(post=post).values_list(
+            "related_id", flat=True
+        )
+    )
+
+
+def test_related_posts_share_words(topic_posts):
+    call_command("build_related_posts")
+    for first, second in topic_posts:
+        assert get_related_ids(first) == [second.id], (
+            "Убедитесь, что похожими считаются публикации с общими словами."
+        )
+        assert get_related_ids(second) == [first.id]
+
+
+def test_detail_shows_related(client, topic_posts):
+    first, second = topic_posts[0]
+    second.title = "Похожая публикация о винограде"
+    second.save()
+    call_command("build_related_posts")
+    content = client.get(f"/posts/{first.id}/").content.decode("utf-8")
+    assert "Похожая публикация о винограде" in content, (
+        "Убедитесь, что на странице публикации выводятся похожие."
+    )
+
+    Post.objects.filter(pk=second.pk).update(is_published=False)
+    content = client.get(f"/posts/{first.id}/").content.decode("utf-8")
+    assert "Похожая публикация о винограде" not in content, (
+        "Убедитесь, что скрытые публикации не выводятся среди похожих."
+    )
+
+
+def test_new_only_updates_neighbors(make_post, topic_posts):
+    call_command("build_related_posts")
+    first, second = topic_posts[1]
+    new = make_post(f"{TOPICS[1]} новая")
+    call_command("build_related_posts", new_only=True)
+    assert set(get_related_ids(new)) == {first.id, second.id}, (
+        "Убедитесь, что `--new-only` считает соседей новых публикаций."
+    )
+    assert new.id in get_related_ids(first), (
+        "Убедитесь, что новая публикация попадает в списки своих соседей."
+    )
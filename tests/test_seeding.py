@@ -0,0 +1,78 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post
+from blog.seeding import seed_dataset
+
+pytestmark = [pytest.mark.django_db]
+
+SEED_OPTIONS = {
+    "users": 20,
+    "categories": 40,
+    "locations": 3,
+    "posts": 2000,
+    "comments": 300,
+    "batch_size": 300,
+    "seed": 0,
+    "scheduled_share": 0.1,
+    "hidden_share": 0.2,
+    "unpublished_category_share": 0.5,
+}
+
+
+def seeded_posts(prefix):
+    return Post.all_objects.filter(category__slug__startswith=prefix)
+
+
+def test_seed_dataset_shares():
+    started = timezone.now()
+    prefix = seed_dataset(workers=2, **SEED_OPTIONS)
+    posts = seeded_posts(prefix)
+    assert posts.count() == SEED_OPTIONS["posts"]
+    assert Comment.objects.filter(post__in=posts).count() == (
+        SEED_OPTIONS["comments"]
+    )
+    hidden = posts.filter(is_published=False).count() / posts.count()
+    scheduled = posts.filter(pub_date__gt=started).count() / posts.count()
+    assert 0.15 < hidden < 0.25, (
+        "Убедитесь, что доля снятых с публикации постов близка"
+        " к hidden_share."
+    )
+    assert 0.06 < scheduled < 0.14, (
+        "Убедитесь, что доля отложенных постов близка к scheduled_share."
+    )
+    categories = Category.objects.filter(slug__startswith=prefix)
+    unpublished = categories.filter(is_published=False).count()
+    assert 0 < unpublished < categories.count(), (
+        "Убедитесь, что часть категорий снята с публикации."
+    )
+
+
+def test_seed_dataset_workers_match_serial():
+    texts = []
+    for workers in (1, 2):
+        prefix = seed_dataset(workers=workers, **SEED_OPTIONS)
+        texts.append(sorted(
+            seeded_posts(prefix).values_list("text", flat=True)
+        ))
+    assert texts[0] == texts[1], (
+        "Убедитесь, что при одном seed посты из нескольких процессов"
+        " совпадают с созданными в одном процессе."
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--users", "0"],
+        ["--categories", "0"],
+        ["--posts", "-1"],
+        ["--workers", "0"],
+        ["--hidden-share", "2"],
+    ],
+)
+def test_seed_blog_rejects_bad_counts(args):
+    with pytest.raises(CommandError):
+        call_command("seed_blog", "--posts", "10", *args)
+    assert not Post.objects.exists()
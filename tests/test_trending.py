@@ -0,0 +1,83 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.trending import rescore_trending
+from blog.views import get_trending_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        Post,
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def get_trending_ids(client):
+    response = client.get("/trending/")
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_trending_follows_comments(user_client, posts):
+    hot, warm, quiet = posts
+    for post, total in ((hot, 2), (warm, 1)):
+        for _ in range(total):
+            user_client.post(f"/posts/{post.id}/comment/", {"text": "Да"})
+    assert get_trending_ids(user_client) == [hot.id, warm.id], (
+        "Убедитесь, что лента `trending/` показывает обсуждаемые публикации"
+        " по убыванию рейтинга, а публикации без комментариев в неё"
+        " не попадают."
+    )
+    content = user_client.get("/trending/").content.decode("utf-8")
+    assert hot.title in content
+
+
+def test_rescore_matches_incremental_score(user, posts):
+    hot, warm, _ = posts
+    for post in (hot, hot, warm):
+        Comment.objects.create(post=post, author=user, text="Текст")
+    scores = dict(Post.objects.values_list("pk", "trending_score"))
+    Post.objects.update(trending_score=None)
+    assert rescore_trending() == 2
+    for pk, score in Post.objects.values_list("pk", "trending_score"):
+        assert score == pytest.approx(scores[pk]), (
+            "Убедитесь, что пересчёт даёт тот же рейтинг, что и его"
+            " обновление при добавлении комментария."
+        )
+
+
+def test_old_comments_decay(user, user_client, posts):
+    hot, warm, _ = posts
+    Comment.objects.create(post=hot, author=user, text="Текст")
+    old = Comment.objects.create(post=warm, author=user, text="Текст")
+    Comment.objects.filter(pk=old.pk).update(
+        created_at=timezone.now() - timedelta(days=2)
+    )
+    rescore_trending()
+    assert get_trending_ids(user_client) == [hot.id], (
+        "Убедитесь, что вклад старых комментариев в рейтинг угасает."
+    )
+    assert Post.objects.get(pk=warm.pk).trending_score is None
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="План запроса SQLite."
+)
+def test_trending_uses_score_index():
+    plan = get_trending_posts()[:10].explain()
+    assert "post_trending_score_idx" in plan and "TEMP B-TREE" not in plan, (
+        "Убедитесь, что лента обсуждаемого читается из индекса рейтинга"
+        " по убыванию, без сортировки."
+    )
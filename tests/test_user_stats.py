@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comment, Post, UserStats
+from blog.stats import refresh_user_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_stats(user):
+    return UserStats.objects.get(user=user)
+
+
+def test_stats_follow_writes(
+    user, another_user, user_client, another_user_client,
+    post_with_published_location,
+):
+    post = post_with_published_location
+    assert get_stats(user).last_activity == post.created_at, (
+        "Убедитесь, что создание публикации обновляет активность автора."
+    )
+
+    another_user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Комментарий"}
+    )
+    comment = Comment.objects.get(post=post)
+    assert get_stats(another_user).comment_count == 1, (
+        "Убедитесь, что добавление комментария увеличивает счётчик автора."
+    )
+    assert get_stats(another_user).last_activity == comment.created_at
+
+    user_client.post(f"/posts/{post.id}/delete/")
+    assert get_stats(another_user).comment_count == 0, (
+        "Убедитесь, что удаление публикации уменьшает счётчики авторов"
+        " её комментариев."
+    )
+
+
+def test_refresh_user_stats(user, post_with_published_location):
+    post_with_published_location.comments.create(author=user, text="Текст")
+    UserStats.objects.all().delete()
+    refresh_user_stats([user.id])
+    stats = get_stats(user)
+    assert stats.comment_count == 1, (
+        "Убедитесь, что `refresh_user_stats` пересчитывает счётчики"
+        " по данным в базе."
+    )
+
+
+def test_profile_header_is_cached_until_write(
+    user, another_user_client, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    response = another_user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert "Комментариев: 0" in response.content.decode("utf-8")
+
+    UserStats.objects.filter(user=user).update(comment_count=5)
+    assert "Комментариев: 0" in another_user_client.get(
+        url
+    ).content.decode("utf-8"), (
+        "Убедитесь, что шапка профиля берётся из кэша."
+    )
+
+    post_with_published_location.comments.create(author=user, text="Текст")
+    assert "Комментариев: 6" in another_user_client.get(
+        url
+    ).content.decode("utf-8"), (
+        "Убедитесь, что запись пользователя сбрасывает кэш шапки профиля."
+    )
+
+
+def test_profile_post_count_hides_drafts(
+    user, user_client, another_user_client, post_with_published_location,
+    mixer,
+):
+    mixer.blend(Post, author=user, is_published=False)
+    url = f"/profile/{user.username}/"
+    assert "Публикаций: 1" in another_user_client.get(
+        url
+    ).content.decode("utf-8"), (
+        "Убедитесь, что посетителям профиля не видно число скрытых"
+        " публикаций автора."
+    )
+    assert "Публикаций: 2" in user_client.get(url).content.decode("utf-8")
@@ -0,0 +1,35 @@
+import pytest
+
+from blog.models import Post
+from blog.view_counts import flush_views, record_view
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_views_are_buffered(user_client, post_with_published_location):
+    post = post_with_published_location
+    for _ in range(3):
+        user_client.get(f"/posts/{post.id}/")
+    assert Post.objects.get(pk=post.pk).views == 0, (
+        "Убедитесь, что просмотры копятся в буфере, а не пишутся в базу"
+        " на каждый запрос."
+    )
+    assert flush_views() == 1
+    assert Post.objects.get(pk=post.pk).views == 3, (
+        "Убедитесь, что запись буфера прибавляет накопленные просмотры."
+    )
+    assert "Просмотров: 3" in user_client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что карточка публикации показывает число просмотров."
+    )
+
+
+def test_buffer_flushes_on_interval(settings, post_with_published_location):
+    settings.BLOG_VIEW_FLUSH_INTERVAL = 0
+    post = post_with_published_location
+    record_view(post.id)
+    record_view(post.id)
+    assert Post.objects.get(pk=post.pk).views == 2, (
+        "Убедитесь, что буфер записывается по истечении"
+        " `BLOG_VIEW_FLUSH_INTERVAL`."
+    )
+    assert flush_views() == 0